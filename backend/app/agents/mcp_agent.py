@@ -13,9 +13,10 @@ import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import json
 from dataclasses import dataclass, asdict, field
 
+import orjson
+
 from celery import Task
 from app.agents.worker import celery_app
 from app.services.entity_extractor import get_entity_extractor, ExtractedEntities
@@ -29,6 +30,9 @@ from app.db.client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Per-tool time budget; a tool exceeding it is recorded as failed evidence
+TOOL_TIMEOUT_SECONDS = 10.0
+
 
 @dataclass
 class AgentEvidence:
@@ -128,6 +132,17 @@ class MCPAgentOrchestrator:
         
         logger.info("MCPAgentOrchestrator initialized")
     
+    async def aclose(self) -> None:
+        """
+        Close pooled HTTP clients bound to the running event loop.
+        
+        Call before closing the loop: the tools and reasoner are
+        process-wide singletons, so their clients would otherwise leak
+        when the next task starts on a fresh loop.
+        """
+        await self.company_tool.aclose()
+        await self.reasoner.aclose()
+    
     async def analyze(
         self,
         task_id: str,
@@ -254,14 +269,16 @@ class MCPAgentOrchestrator:
         Returns:
             List of AgentEvidence objects
         """
-        evidence = []
         total_entities = entities.entity_count()
-        processed = 0
+        checks = []
+        
+        def progress_for(processed: int) -> int:
+            return 30 + int((processed / total_entities) * 40)
         
-        # Process phones
+        # Queue phone checks
         for phone_data in entities.phones:
             phone = phone_data["value"]
-            progress_percent = 30 + int((processed / total_entities) * 40)
+            progress_percent = progress_for(len(checks))
             
             progress_publisher.publish(
                 f"Checking phone: {phone}", 
@@ -270,15 +287,12 @@ class MCPAgentOrchestrator:
                 tool="phone_check"
             )
             
-            phone_evidence = await self._check_phone(phone, progress_publisher, progress_percent)
-            evidence.extend(phone_evidence)
-            
-            processed += 1
+            checks.append(self._check_phone(phone, progress_publisher, progress_percent))
         
-        # Process URLs
+        # Queue URL checks
         for url_data in entities.urls:
             url = url_data["value"]
-            progress_percent = 30 + int((processed / total_entities) * 40)
+            progress_percent = progress_for(len(checks))
             
             progress_publisher.publish(
                 f"Checking URL: {url}", 
@@ -287,15 +301,12 @@ class MCPAgentOrchestrator:
                 tool="url_check"
             )
             
-            url_evidence = await self._check_url(url, progress_publisher, progress_percent)
-            evidence.extend(url_evidence)
-            
-            processed += 1
+            checks.append(self._check_url(url, progress_publisher, progress_percent))
         
-        # Process emails
+        # Queue email checks
         for email_data in entities.emails:
             email = email_data["value"]
-            progress_percent = 30 + int((processed / total_entities) * 40)
+            progress_percent = progress_for(len(checks))
             
             progress_publisher.publish(
                 f"Checking email: {email}", 
@@ -304,17 +315,14 @@ class MCPAgentOrchestrator:
                 tool="email_check"
             )
             
-            email_evidence = await self._check_email(email, progress_publisher, progress_percent)
-            evidence.extend(email_evidence)
-            
-            processed += 1
+            checks.append(self._check_email(email, progress_publisher, progress_percent))
         
-        # Process companies
+        # Queue company checks
         for company_data in entities.companies:
             company = company_data["value"]
             normalized = company_data.get("normalized", company)
             category = company_data.get("category", "registered")
-            progress_percent = 30 + int((processed / total_entities) * 40)
+            progress_percent = progress_for(len(checks))
             
             progress_publisher.publish(
                 f"Checking company: {normalized}", 
@@ -326,12 +334,15 @@ class MCPAgentOrchestrator:
             # Determine country code (default to US, could be enhanced with user location)
             country = "US"  # TODO: Get from user profile or detect from text
             
-            company_evidence = await self._check_company(
+            checks.append(self._check_company(
                 company, normalized, country, category, progress_publisher, progress_percent
-            )
-            evidence.extend(company_evidence)
-            
-            processed += 1
+            ))
+        
+        # Entities are independent, so run every entity's tools concurrently;
+        # total time tracks the slowest tool instead of the sum per entity.
+        evidence = []
+        for entity_evidence in await asyncio.gather(*checks):
+            evidence.extend(entity_evidence)
         
         return evidence
     
@@ -530,6 +541,20 @@ class MCPAgentOrchestrator:
         
         return evidence
     
+    @staticmethod
+    async def _call_tool(tool_func):
+        """
+        Invoke a sync or async tool callable without blocking the event loop.
+        
+        The callable runs in a worker thread: sync tools (e.g. Supabase
+        lookups) execute there, async tools just return their coroutine,
+        which is then awaited on the loop.
+        """
+        result = await asyncio.to_thread(tool_func)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+    
     async def _run_tool(
         self,
         tool_name: str,
@@ -573,15 +598,12 @@ class MCPAgentOrchestrator:
                 tool=tool_name
             )
             
-            # Run tool (handle both sync and async)
-            # First call the function to get the result or coroutine
-            result = tool_func()
-            
-            # If the result is a coroutine, await it
-            if asyncio.iscoroutine(result):
-                result = await result
-            # If tool_func was a sync callable that returned a value, we already have it
-            # No need to run in executor since tool_func() already executed
+            # Run tool (handle both sync and async) with a per-tool timeout so
+            # one slow tool cannot stall the other gathered tools
+            result = await asyncio.wait_for(
+                self._call_tool(tool_func),
+                timeout=TOOL_TIMEOUT_SECONDS
+            )
             
             # Convert result to dict if needed
             if hasattr(result, 'to_dict'):
@@ -598,6 +620,22 @@ class MCPAgentOrchestrator:
                 execution_time_ms=execution_time
             )
         
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Tool {tool_name} timed out for {entity_type}/{entity_value} "
+                f"(>{TOOL_TIMEOUT_SECONDS}s)"
+            )
+            execution_time = (datetime.now() - start_time).total_seconds() * 1000
+            
+            return AgentEvidence(
+                tool_name=tool_name,
+                entity_type=entity_type,
+                entity_value=entity_value,
+                result={"error": f"Tool timed out after {TOOL_TIMEOUT_SECONDS}s"},
+                success=False,
+                execution_time_ms=execution_time
+            )
+        
         except Exception as e:
             logger.error(f"Tool {tool_name} failed for {entity_type}/{entity_value}: {e}")
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -737,7 +775,8 @@ class ProgressPublisher:
             return
         
         try:
-            data = json.dumps({
+            # orjson emits bytes directly; redis publishes them as-is
+            data = orjson.dumps({
                 "step": step,
                 "tool": tool,
                 "message": message,
@@ -799,6 +838,7 @@ def analyze_with_mcp_agent(
                 orchestrator.analyze(task_id, ocr_text, progress)
             )
         finally:
+            loop.run_until_complete(orchestrator.aclose())
             loop.close()
         
         # Save to database
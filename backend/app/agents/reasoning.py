@@ -7,18 +7,56 @@ Story: 8.8 - Agent Reasoning with LLM
 """
 
 import os
-import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+import string
+from typing import Dict, Any, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, asdict, field, replace
 import asyncio
+import bisect
+import functools
+import threading
+import time
+from datetime import timedelta
+from types import MappingProxyType
+
+import orjson
+
+from app.config import settings
+from app.services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Verdict cache settings (keyed on evidence fingerprint)
+REASONING_CACHE_TTL = 3600  # 1 hour
+REASONING_CACHE_MAX_SIZE = 1000
+
+# Verdict vocabulary and request config are frozen once at import so the
+# hot path never rebuilds them (and they stay byte-stable across calls).
+_RISK_LEVELS: frozenset[str] = frozenset({"low", "medium", "high"})
+_GEMINI_GENERATION_CONFIG = MappingProxyType({"temperature": 0.2})  # Low temperature for consistent reasoning
+
+# Shared HTTP/2 connection pool for OpenAI requests (reason_batch fans out)
+LLM_HTTP_MAX_CONNECTIONS = 32
+LLM_HTTP_MAX_KEEPALIVE = 16
+
+# Extend the Gemini prompt cache this long before its TTL lapses
+PROMPT_CACHE_REFRESH_MARGIN = 60  # seconds
+
+# OCR context sent to the LLM is capped to keep prompts within token limits
+OCR_PREVIEW_CHARS = 500
+
+# Result fields that actually drive a verdict; everything else (timings,
+# titles, URLs) is excluded from the fingerprint so repeats still hit.
+_FINGERPRINT_FIELDS = (
+    "found", "report_count", "risk_score", "verified", "risk_level",
+    "virustotal_malicious", "age_days", "suspicious", "suspicious_reason",
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class ReasoningResult:
-    """Result from agent reasoning."""
+    """Result from agent reasoning (slotted: no per-instance __dict__)."""
     risk_level: str  # low, medium, high
     confidence: float  # 0-100
     explanation: str
@@ -28,6 +66,202 @@ class ReasoningResult:
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return asdict(self)
+    
+    def copy(self) -> "ReasoningResult":
+        """Return an independent copy (evidence_used is not shared)."""
+        return replace(self, evidence_used=list(self.evidence_used))
+
+
+def _format_scam_db(tool_name: str, entity: str, result: Dict[str, Any]) -> str:
+    """Format scam database evidence."""
+    if not result.get("found"):
+        return f"Tool: Scam Database | Entity: {entity} | NOT FOUND"
+    
+    verified_text = " (VERIFIED)" if result.get("verified", False) else ""
+    return (
+        f"Tool: Scam Database | Entity: {entity} | "
+        f"FOUND{verified_text} - {result.get('report_count', 0)} reports, "
+        f"risk score {result.get('risk_score', 0)}"
+    )
+
+
+def _format_exa_search(tool_name: str, entity: str, result: Dict[str, Any]) -> str:
+    """Format web search evidence with up to two sample titles."""
+    results = result.get("results", [])
+    if not results:
+        return f"Tool: Web Search | Entity: {entity} | No results"
+    
+    sample_titles = [res.get("title", "")[:60] for res in results[:2] if res.get("title", "")]
+    titles_preview = " | Examples: " + "; ".join(sample_titles) if sample_titles else ""
+    return (
+        f"Tool: Web Search | Entity: {entity} | "
+        f"FOUND {len(results)} web complaints/reports{titles_preview}"
+    )
+
+
+def _format_domain_reputation(tool_name: str, entity: str, result: Dict[str, Any]) -> str:
+    """Format domain reputation evidence."""
+    age_days = result.get("age_days")
+    age_text = f"{age_days} days" if age_days is not None else "unknown"
+    return (
+        f"Tool: Domain Reputation | Entity: {entity} | "
+        f"Risk: {result.get('risk_level', 'unknown')}, "
+        f"VirusTotal: {result.get('virustotal_malicious', 0)} engines flagged, Age: {age_text}"
+    )
+
+
+def _format_phone_validator(tool_name: str, entity: str, result: Dict[str, Any]) -> str:
+    """Format phone validator evidence."""
+    if result.get("suspicious"):
+        return (
+            f"Tool: Phone Validator | Entity: {entity} | "
+            f"SUSPICIOUS - {result.get('suspicious_reason', 'Unknown reason')}"
+        )
+    return (
+        f"Tool: Phone Validator | Entity: {entity} | "
+        f"Valid {result.get('number_type', 'unknown')} number"
+    )
+
+
+def _format_generic(tool_name: str, entity: str, result: Dict[str, Any]) -> str:
+    """Format evidence from tools without a dedicated formatter."""
+    return f"Tool: {tool_name} | Entity: {entity} | Result: {str(result)[:100]}"
+
+
+def _score_scam_db(result: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """Score scam DB findings (highest weight - authoritative source)."""
+    if not result.get("found"):
+        return 0, []
+    
+    report_count = result.get("report_count", 0)
+    
+    # Higher weight for verified reports
+    if result.get("verified"):
+        points = min(result.get("risk_score", 0) * 0.6, 50)  # Max 50 points for verified
+        return points, [f"Verified scam in database ({report_count} reports)"]
+    
+    points = min(report_count * 5, 40)  # Max 40 points
+    return points, [f"Found in scam database ({report_count} reports)"]
+
+
+def _score_exa_search(result: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """Score Exa search results (web complaints and reports)."""
+    results_list = result.get("results", [])
+    if not results_list:
+        return 0, []
+    
+    result_count = len(results_list)
+    return min(result_count * 2, 20), [f"Found {result_count} web complaints/reports"]  # Max 20 points
+
+
+# Domain reputation risk level -> (points, reason); other levels score 0
+_DOMAIN_RISK_POINTS = {
+    "high": (30, "Domain flagged as high risk"),
+    "medium": (15, "Domain flagged as medium risk"),
+}
+
+def _score_domain_reputation(result: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """Score domain reputation (for URLs)."""
+    points = 0
+    reasons = []
+    
+    risk_points = _DOMAIN_RISK_POINTS.get(result.get("risk_level"))
+    if risk_points:
+        points += risk_points[0]
+        reasons.append(risk_points[1])
+    
+    # Add points for young domain
+    age_days = result.get("age_days")
+    if age_days is not None and age_days < 30:
+        points += 10
+        reasons.append(f"Very new domain ({age_days} days old)")
+    
+    return points, reasons
+
+
+def _score_phone_validator(result: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """Score phone validator suspicious patterns."""
+    if not result.get("suspicious"):
+        return 0, []
+    
+    suspicious_reason = result.get("suspicious_reason", "Unknown")
+    return 25, [f"Suspicious phone pattern: {suspicious_reason}"]
+
+
+# Per-tool heuristic scorers used by the fallback path
+_HEURISTIC_SCORERS = {
+    "scam_db": _score_scam_db,
+    "exa_search": _score_exa_search,
+    "domain_reputation": _score_domain_reputation,
+    "phone_validator": _score_phone_validator,
+}
+
+# Heuristic score cut-offs: below 40 is low, 40-69 medium, 70+ high
+_SCORE_THRESHOLDS = (40, 70)
+_SCORE_RISK_LEVELS = ("low", "medium", "high")
+
+
+# Per-tool evidence formatters (dict dispatch instead of an if/elif chain)
+_EVIDENCE_FORMATTERS = {
+    "scam_db": _format_scam_db,
+    "exa_search": _format_exa_search,
+    "domain_reputation": _format_domain_reputation,
+    "phone_validator": _format_phone_validator,
+}
+
+
+@dataclass(slots=True)
+class _HeuristicScore:
+    """Heuristic risk score accumulated while evidence is formatted."""
+    score: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+    
+    def add(self, tool_name: str, result: Dict[str, Any]) -> None:
+        """Add one successful tool result to the running score."""
+        # Risk level and confidence are saturated at 100; further evidence
+        # cannot change the verdict.
+        if self.score >= 100:
+            return
+        
+        scorer = _HEURISTIC_SCORERS.get(tool_name)
+        if scorer is None:
+            return
+        
+        points, tool_reasons = scorer(result)
+        self.score += points
+        self.reasons.extend(tool_reasons)
+
+
+class _JsonObjectScanner:
+    """Track streamed LLM text until the first top-level JSON object closes."""
+    
+    __slots__ = ("depth", "in_string", "escaped")
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> bool:
+        """Consume a chunk of text; return True once the object is complete."""
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{":
+                self.depth += 1
+            elif self.depth:
+                if ch == '"':
+                    self.in_string = True
+                elif ch == "}":
+                    self.depth -= 1
+                    if self.depth == 0:
+                        return True
+        return False
 
 
 class AgentReasoner:
@@ -91,6 +325,29 @@ IMPORTANT: Always output valid JSON in the exact format above. Do not include ma
             api_key: Optional API key (uses env var if not provided)
         """
         self.model = model
+        # Bounds in-flight LLM calls; rebuilt per event loop because Celery
+        # tasks each run on a fresh loop and asyncio primitives bind to one
+        self._llm_slots = None
+        self._llm_slots_loop = None
+        # Pooled HTTP client owned by this reasoner (OpenAI only; Gemini's
+        # SDK already multiplexes requests over a single gRPC channel).
+        # Like the slots above it is bound to the loop that created it.
+        self._http = None
+        self._http_loop = None
+        self.openai_client = None
+        # Loop the Gemini models' grpc.aio client is currently bound to
+        self._gemini_loop = None
+        # Gemini model bound to a cached copy of SYSTEM_PROMPT (if enabled),
+        # plus the CachedContent itself and when its TTL runs out
+        self.cached_llm_model = None
+        self._prompt_cache = None
+        self._prompt_cache_expires_at = 0.0
+        self._prompt_cache_lock = threading.Lock()
+        # LLM verdicts keyed on evidence fingerprint
+        self._result_cache = TTLCache(
+            ttl_seconds=REASONING_CACHE_TTL,
+            max_size=REASONING_CACHE_MAX_SIZE
+        )
         
         if model == "gemini":
             self.api_key = api_key or os.getenv('GEMINI_API_KEY')
@@ -101,20 +358,146 @@ IMPORTANT: Always output valid JSON in the exact format above. Do not include ma
             from app.services.gemini_service import get_model
             self.llm_model = get_model()
             
+            if settings.gemini_prompt_cache:
+                self.cached_llm_model = self._create_cached_model()
+            
         elif model == "gpt4" or model == "gpt4o-mini":
             self.api_key = api_key or os.getenv('OPENAI_API_KEY')
             if not self.api_key:
                 raise ValueError("OPENAI_API_KEY not configured")
             
-            # Use OpenAI
-            from openai import AsyncOpenAI
-            self.openai_client = AsyncOpenAI(api_key=self.api_key)
+            # The OpenAI client is created per event loop on first use
             self.openai_model = "gpt-4o-mini" if model == "gpt4o-mini" else "gpt-4o"
         else:
             raise ValueError(f"Unsupported model: {model}")
         
         logger.info(f"AgentReasoner initialized (model={model})")
     
+    def _get_openai_client(self):
+        """
+        Get the OpenAI client for the running event loop.
+        
+        Requests share one keep-alive HTTP/2 pool instead of handshaking per
+        request; a new pool is created when the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_loop is not loop:
+            import httpx
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+            self._http = DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE
+                )
+            )
+            self.openai_client = AsyncOpenAI(api_key=self.api_key, http_client=self._http)
+            self._http_loop = loop
+        return self.openai_client
+    
+    def _bind_gemini_client(self) -> None:
+        """
+        Give the Gemini models a grpc.aio client for the running event loop.
+        
+        google-generativeai caches one async client per process (and per
+        model), but a grpc.aio channel only works on the loop it first ran
+        on. Celery tasks each run on a fresh loop, so the cached client is
+        dropped and the models lazily fetch a new default when it changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._gemini_loop is not loop:
+            from google.generativeai import client as genai_client
+            genai_client._client_manager.clients.pop("generative_async", None)
+            self.llm_model._async_client = None
+            if self.cached_llm_model is not None:
+                self.cached_llm_model._async_client = None
+            self._gemini_loop = loop
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP/gRPC clients, if any are open on this loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is not None and self._http_loop is loop:
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+        self.openai_client = None
+        
+        if self._gemini_loop is loop:
+            async_client = self.llm_model._async_client
+            if async_client is not None:
+                await async_client.transport.close()
+            self._gemini_loop = None
+    
+    def _create_cached_model(self):
+        """
+        Create a Gemini model backed by a context cache of SYSTEM_PROMPT.
+        
+        The static preamble is prefilled once and reused across requests, so
+        each call only sends the per-request OCR/entities/evidence. Gemini
+        enforces a minimum cacheable token count; if creation fails for that
+        or any other reason we keep sending the preamble inline.
+        
+        The cache expires after gemini_prompt_cache_ttl, so its expiry is
+        tracked here and _refresh_prompt_cache renews it before then.
+        
+        Returns:
+            GenerativeModel bound to the cache, or None if caching failed
+        """
+        try:
+            import google.generativeai as genai
+            from app.services.gemini_service import GEMINI_MODEL_NAME, SAFETY_SETTINGS
+            
+            ttl = settings.gemini_prompt_cache_ttl
+            cache = genai.caching.CachedContent.create(
+                model=GEMINI_MODEL_NAME,
+                display_name="agent-reasoning-preamble",
+                system_instruction=self.SYSTEM_PROMPT,
+                ttl=timedelta(seconds=ttl)
+            )
+            logger.info(f"Gemini prompt cache created: {cache.name}")
+            model = genai.GenerativeModel.from_cached_content(
+                cache,
+                safety_settings=SAFETY_SETTINGS
+            )
+            self._prompt_cache = cache
+            self._prompt_cache_expires_at = time.monotonic() + ttl
+            return model
+        except Exception as e:
+            logger.warning(f"Gemini prompt cache unavailable, sending preamble inline: {e}")
+            self._prompt_cache = None
+            return None
+    
+    def _prompt_cache_stale(self) -> bool:
+        """Whether the Gemini prompt cache has lapsed or is about to."""
+        return (
+            self._prompt_cache is not None
+            and time.monotonic() >= self._prompt_cache_expires_at - PROMPT_CACHE_REFRESH_MARGIN
+        )
+    
+    def _refresh_prompt_cache(self) -> None:
+        """
+        Extend the Gemini prompt cache TTL, recreating the cache if it has
+        already lapsed or cannot be extended.
+        
+        Blocking SDK call; run it off the event loop. The lock keeps
+        concurrent requests from renewing the same cache twice.
+        """
+        with self._prompt_cache_lock:
+            if not self._prompt_cache_stale():
+                return
+            
+            if time.monotonic() < self._prompt_cache_expires_at:
+                ttl = settings.gemini_prompt_cache_ttl
+                try:
+                    self._prompt_cache.update(ttl=timedelta(seconds=ttl))
+                    self._prompt_cache_expires_at = time.monotonic() + ttl
+                    logger.info(f"Gemini prompt cache extended: {self._prompt_cache.name}")
+                    return
+                except Exception as e:
+                    logger.warning(f"Gemini prompt cache extension failed, recreating: {e}")
+            
+            self.cached_llm_model = self._create_cached_model()
+    
     async def reason(
         self,
         evidence: List[Dict[str, Any]],
@@ -132,15 +515,80 @@ IMPORTANT: Always output valid JSON in the exact format above. Do not include ma
         Returns:
             ReasoningResult with risk level, confidence, and explanation
         """
+        results = await self.reason_batch([(evidence, ocr_text, entities_found)])
+        return results[0]
+    
+    async def reason_batch(
+        self,
+        cases: List[Tuple[List[Dict[str, Any]], str, Dict[str, List[str]]]]
+    ) -> List[ReasoningResult]:
+        """
+        Reason over several independent cases concurrently.
+        
+        LLM calls are network-bound, so fanning them out with asyncio.gather
+        makes N verdicts cost roughly one round-trip instead of N.
+        
+        Args:
+            cases: List of (evidence, ocr_text, entities_found) tuples
+        
+        Returns:
+            List of ReasoningResult in the same order as cases
+        """
+        return list(await asyncio.gather(
+            *(self._reason_single(*case) for case in cases)
+        ))
+    
+    async def _reason_single(
+        self,
+        evidence: List[Dict[str, Any]],
+        ocr_text: str,
+        entities_found: Dict[str, List[str]]
+    ) -> ReasoningResult:
+        """Reason over a single case with retry and heuristic fallback."""
+        # Without successful evidence the verdict rests on the OCR text and
+        # entities alone, which the fingerprint does not cover; don't cache.
+        if not any(e.get("success") for e in evidence):
+            return await self._reason_uncached(evidence, ocr_text, entities_found)
+        
+        # Verdicts are data-dependent, so the cache key is a digest of the
+        # decision-relevant evidence rather than the raw OCR text.
+        cache_key = self._evidence_fingerprint(evidence)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Reasoning cache hit")
+            return cached.copy()
+        
+        result = await self._reason_uncached(evidence, ocr_text, entities_found)
+        
+        # Only cache LLM verdicts; heuristic results reflect a transient failure.
+        # Store a copy so callers mutating their result can't alter the cache.
+        if result.reasoning_method == "llm":
+            self._result_cache.set(cache_key, result.copy())
+        return result
+    
+    async def _reason_uncached(
+        self,
+        evidence: List[Dict[str, Any]],
+        ocr_text: str,
+        entities_found: Dict[str, List[str]]
+    ) -> ReasoningResult:
+        """Query the LLM for a verdict, retrying once before falling back."""
+        # Truncate once here; nothing downstream needs the full OCR text
+        ocr_text = ocr_text[:OCR_PREVIEW_CHARS] if ocr_text else ""
+        heuristic = None
+        
+        # Renew the prompt cache before building the prompt, so the prompt
+        # matches whichever model (cached or inline preamble) is live
+        if self._prompt_cache_stale():
+            await asyncio.to_thread(self._refresh_prompt_cache)
+        
         try:
-            # Build prompt
-            prompt = self._build_prompt(evidence, ocr_text, entities_found)
+            # Format evidence and score it for the fallback in a single pass
+            formatted_evidence, heuristic = self._format_and_score(evidence)
+            prompt = self._build_prompt(formatted_evidence, ocr_text, entities_found)
             
             # Query LLM with timeout
-            response = await asyncio.wait_for(
-                self._query_llm(prompt),
-                timeout=5.0
-            )
+            response = await self._query_llm_bounded(prompt)
             
             # Parse response
             result = self._parse_llm_response(response)
@@ -152,10 +600,7 @@ IMPORTANT: Always output valid JSON in the exact format above. Do not include ma
                 # Retry once if parsing failed
                 logger.warning("LLM response parsing failed, retrying once...")
                 try:
-                    response = await asyncio.wait_for(
-                        self._query_llm(prompt),
-                        timeout=5.0
-                    )
+                    response = await self._query_llm_bounded(prompt)
                     result = self._parse_llm_response(response)
                     if result:
                         return result
@@ -164,135 +609,98 @@ IMPORTANT: Always output valid JSON in the exact format above. Do not include ma
                 
                 # Fall back to heuristic
                 logger.warning("Falling back to heuristic after retry failure")
-                return self._heuristic_fallback(evidence)
+                return self._heuristic_fallback(evidence, heuristic)
         
         except asyncio.TimeoutError:
             logger.warning("LLM reasoning timeout (>5s), falling back to heuristic")
-            return self._heuristic_fallback(evidence)
+            return self._heuristic_fallback(evidence, heuristic)
         
         except Exception as e:
             logger.error(f"LLM reasoning error: {e}", exc_info=True)
-            return self._heuristic_fallback(evidence)
+            return self._heuristic_fallback(evidence, heuristic)
+    
+    @staticmethod
+    def _evidence_fingerprint(evidence: List[Dict[str, Any]]) -> str:
+        """
+        Build a stable digest of the decision-relevant parts of evidence.
+        
+        Args:
+            evidence: List of evidence dictionaries from tools
+        
+        Returns:
+            Hex digest identifying the evidence shape
+        """
+        canonical = []
+        for e in evidence:
+            result = e.get("result") or {}
+            fields = {k: result[k] for k in _FINGERPRINT_FIELDS if k in result}
+            if "results" in result:
+                fields["results"] = len(result["results"])
+            canonical.append((
+                e.get("tool_name"),
+                e.get("entity_type"),
+                e.get("entity_value"),
+                bool(e.get("success")),
+                fields,
+            ))
+        canonical.sort(key=lambda item: orjson.dumps(item[:3], default=str))
+        payload = orjson.dumps(canonical, default=str, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
     
     def _build_prompt(
         self,
-        evidence: List[Dict[str, Any]],
+        formatted_evidence: str,
         ocr_text: str,
         entities_found: Dict[str, List[str]]
     ) -> str:
         """Build prompt for LLM."""
-        # Format evidence
-        evidence_text = self._format_evidence(evidence)
-        
-        # Format entities
-        entities_text = self._format_entities(entities_found)
+        # Stable preamble first, volatile per-request sections after it. When
+        # the preamble lives in a Gemini context cache it is omitted here.
+        preamble = "" if self.cached_llm_model else _PROMPT_PREAMBLE
         
-        # Truncate OCR text to avoid exceeding token limits
-        ocr_preview = ocr_text[:500] if ocr_text else "No OCR text available"
-        
-        prompt = f"""{self.SYSTEM_PROMPT}
-
----
-
-OCR Text from Screenshot:
-\"\"\"{ocr_preview}\"\"\"
-
-Entities Extracted:
-{entities_text}
-
-Evidence Collected:
-{evidence_text}
-
----
-
-Based on the evidence above, determine:
-1. Risk level (low, medium, or high)
-2. Confidence score (0-100)
-3. Detailed explanation citing specific evidence
-
-Output your analysis in JSON format as specified above."""
-        
-        return prompt
+        return _PROMPT_TEMPLATE.substitute(
+            preamble=preamble,
+            ocr=ocr_text or "No OCR text available",
+            entities=self._format_entities(entities_found),
+            evidence=formatted_evidence
+        )
     
     def _format_evidence(self, evidence: List[Dict[str, Any]]) -> str:
         """Format evidence for prompt."""
+        return self._format_and_score(evidence)[0]
+    
+    def _format_and_score(
+        self,
+        evidence: List[Dict[str, Any]]
+    ) -> Tuple[str, _HeuristicScore]:
+        """
+        Format evidence for the prompt and accumulate its heuristic score.
+        
+        Args:
+            evidence: List of evidence dictionaries from tools
+        
+        Returns:
+            Tuple of (formatted evidence text, heuristic score for fallback)
+        """
+        heuristic = _HeuristicScore()
         if not evidence:
-            return "No evidence collected (all tools failed or returned no results)."
+            return "No evidence collected (all tools failed or returned no results).", heuristic
         
         formatted = []
         for i, e in enumerate(evidence, 1):
             tool_name = e.get("tool_name", "unknown")
-            entity_type = e.get("entity_type", "unknown")
-            entity_value = e.get("entity_value", "unknown")
-            result = e.get("result", {})
-            success = e.get("success", False)
+            entity = f"{e.get('entity_type', 'unknown')}:{e.get('entity_value', 'unknown')}"
             
-            if not success:
-                formatted.append(f"{i}. Tool: {tool_name} | Entity: {entity_type}:{entity_value} | Result: FAILED")
+            if not e.get("success", False):
+                formatted.append(f"{i}. Tool: {tool_name} | Entity: {entity} | Result: FAILED")
                 continue
             
-            # Format based on tool type
-            if tool_name == "scam_db":
-                if result.get("found"):
-                    report_count = result.get("report_count", 0)
-                    risk_score = result.get("risk_score", 0)
-                    verified = result.get("verified", False)
-                    verified_text = " (VERIFIED)" if verified else ""
-                    formatted.append(
-                        f"{i}. Tool: Scam Database | Entity: {entity_type}:{entity_value} | "
-                        f"FOUND{verified_text} - {report_count} reports, risk score {risk_score}"
-                    )
-                else:
-                    formatted.append(f"{i}. Tool: Scam Database | Entity: {entity_type}:{entity_value} | NOT FOUND")
-            
-            elif tool_name == "exa_search":
-                result_count = len(result.get("results", []))
-                if result_count > 0:
-                    # Include sample titles from results
-                    sample_titles = []
-                    for res in result.get("results", [])[:2]:  # First 2 results
-                        title = res.get("title", "")
-                        if title:
-                            sample_titles.append(title[:60])
-                    
-                    titles_preview = " | Examples: " + "; ".join(sample_titles) if sample_titles else ""
-                    formatted.append(
-                        f"{i}. Tool: Web Search | Entity: {entity_type}:{entity_value} | "
-                        f"FOUND {result_count} web complaints/reports{titles_preview}"
-                    )
-                else:
-                    formatted.append(f"{i}. Tool: Web Search | Entity: {entity_type}:{entity_value} | No results")
-            
-            elif tool_name == "domain_reputation":
-                risk_level = result.get("risk_level", "unknown")
-                vt_score = result.get("virustotal_malicious", 0)
-                age_days = result.get("age_days")
-                age_text = f"{age_days} days" if age_days is not None else "unknown"
-                formatted.append(
-                    f"{i}. Tool: Domain Reputation | Entity: {entity_type}:{entity_value} | "
-                    f"Risk: {risk_level}, VirusTotal: {vt_score} engines flagged, Age: {age_text}"
-                )
-            
-            elif tool_name == "phone_validator":
-                if result.get("suspicious"):
-                    formatted.append(
-                        f"{i}. Tool: Phone Validator | Entity: {entity_type}:{entity_value} | "
-                        f"SUSPICIOUS - {result.get('suspicious_reason', 'Unknown reason')}"
-                    )
-                else:
-                    number_type = result.get("number_type", "unknown")
-                    formatted.append(
-                        f"{i}. Tool: Phone Validator | Entity: {entity_type}:{entity_value} | "
-                        f"Valid {number_type} number"
-                    )
-            else:
-                # Generic formatting for unknown tools
-                formatted.append(
-                    f"{i}. Tool: {tool_name} | Entity: {entity_type}:{entity_value} | "
-                    f"Result: {str(result)[:100]}"
-                )
+            result = e.get("result", {})
+            formatter = _EVIDENCE_FORMATTERS.get(tool_name, _format_generic)
+            formatted.append(f"{i}. {formatter(tool_name, entity, result)}")
+            heuristic.add(tool_name, result)
         
-        return "\n".join(formatted)
+        return "\n".join(formatted), heuristic
     
     def _format_entities(self, entities_found: Dict[str, List[str]]) -> str:
         """Format entities for prompt."""
@@ -306,24 +714,68 @@ Output your analysis in JSON format as specified above."""
         
         return "\n".join(parts) if parts else "No entities found"
     
+    async def _query_llm_bounded(self, prompt: str) -> str:
+        """
+        Query the LLM once a concurrency slot is free.
+        
+        The 5-second timeout covers only the LLM call, not time spent queued
+        for a slot, so a large reason_batch does not trip the fallback.
+        """
+        loop = asyncio.get_running_loop()
+        if self._llm_slots_loop is not loop:
+            self._llm_slots = asyncio.Semaphore(settings.llm_max_concurrency)
+            self._llm_slots_loop = loop
+        
+        async with self._llm_slots:
+            return await asyncio.wait_for(self._query_llm(prompt), timeout=5.0)
+    
     async def _query_llm(self, prompt: str) -> str:
         """Query LLM with prompt."""
         if self.model == "gemini":
-            # Use Gemini generate_content
-            response = await asyncio.to_thread(
-                self.llm_model.generate_content,
-                prompt,
-                generation_config={'temperature': 0.2}  # Low temperature for consistent reasoning
-            )
+            # Use Gemini's native async client (no thread-pool hop)
+            self._bind_gemini_client()
+            llm_model = self.cached_llm_model
+            if llm_model is None:
+                llm_model = self.llm_model
+                prompt = _with_preamble(prompt)
+            
+            try:
+                response = await llm_model.generate_content_async(
+                    prompt,
+                    generation_config=_GEMINI_GENERATION_CONFIG,
+                    stream=True
+                )
+            except Exception as e:
+                if llm_model is self.llm_model or not _is_prompt_cache_miss(e):
+                    raise
+                # Cache lapsed server-side: have the next request recreate
+                # it, and answer this one with the preamble sent inline
+                logger.warning(f"Gemini prompt cache expired, retrying inline: {e}")
+                self._prompt_cache_expires_at = 0.0
+                response = await self.llm_model.generate_content_async(
+                    _with_preamble(prompt),
+                    generation_config=_GEMINI_GENERATION_CONFIG,
+                    stream=True
+                )
             
-            if not response or not response.text:
+            # Stop reading as soon as the verdict object closes instead of
+            # waiting for trailing fences/prose to finish decoding.
+            chunks = []
+            scanner = _JsonObjectScanner()
+            async for chunk in response:
+                chunks.append(chunk.text)
+                if scanner.feed(chunk.text):
+                    break
+            
+            text = "".join(chunks)
+            if not text:
                 raise ValueError("Empty response from Gemini")
             
-            return response.text
+            return text
         
         elif self.model in ["gpt4", "gpt4o-mini"]:
             # Use OpenAI ChatCompletion
-            response = await self.openai_client.chat.completions.create(
+            response = await self._get_openai_client().chat.completions.create(
                 model=self.openai_model,
                 messages=[
                     {"role": "system", "content": "You are a scam detection expert analyzing evidence."},
@@ -344,29 +796,27 @@ Output your analysis in JSON format as specified above."""
     def _parse_llm_response(self, response: str) -> Optional[ReasoningResult]:
         """Parse LLM response into ReasoningResult."""
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            json_str = response.strip()
-            
-            # Remove markdown code blocks if present
-            if "```json" in json_str:
-                json_str = json_str.split("```json")[1].split("```")[0].strip()
-            elif "```" in json_str:
-                # Try to extract content between first ``` pair
-                parts = json_str.split("```")
-                if len(parts) >= 3:
-                    json_str = parts[1].strip()
-            
-            # Try to find JSON object in text
+            # Slice out the JSON object. Markdown fences (```json ... ```)
+            # always sit outside the braces, so this also strips them.
+            json_str = response
             start_idx = json_str.find("{")
             end_idx = json_str.rfind("}")
             if start_idx != -1 and end_idx != -1:
                 json_str = json_str[start_idx:end_idx + 1]
             
-            data = json.loads(json_str)
-            
+            return self._validate_verdict(orjson.loads(json_str))
+        
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            logger.debug(f"LLM response: {response[:500]}")
+            return None
+    
+    def _validate_verdict(self, data: Mapping[str, Any]) -> Optional[ReasoningResult]:
+        """Validate a decoded LLM verdict into ReasoningResult."""
+        try:
             # Validate fields
             risk_level = data.get("risk_level", "").lower()
-            if risk_level not in ["low", "medium", "high"]:
+            if risk_level not in _RISK_LEVELS:
                 logger.warning(f"Invalid risk_level from LLM: {risk_level}")
                 return None
             
@@ -392,85 +842,40 @@ Output your analysis in JSON format as specified above."""
                 reasoning_method="llm"
             )
         
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM response as JSON: {e}")
-            logger.debug(f"LLM response: {response[:500]}")
-            return None
-        
         except (ValueError, KeyError) as e:
             logger.error(f"Error parsing LLM response: {e}")
             return None
     
-    def _heuristic_fallback(self, evidence: List[Dict[str, Any]]) -> ReasoningResult:
+    def _heuristic_fallback(
+        self,
+        evidence: List[Dict[str, Any]],
+        heuristic: Optional[_HeuristicScore] = None
+    ) -> ReasoningResult:
         """
         Fallback heuristic reasoning when LLM unavailable.
         
         This is the same heuristic logic from Story 8.7, used as a reliable
         fallback when LLM fails, times out, or returns invalid output.
+        
+        Args:
+            evidence: List of evidence dictionaries from tools
+            heuristic: Score already accumulated by _format_and_score, if any
         """
-        score = 0.0
-        reasons = []
+        if heuristic is None:
+            heuristic = _HeuristicScore()
+            for e in evidence:
+                if e.get("success"):
+                    heuristic.add(e.get("tool_name"), e.get("result", {}))
         
-        for e in evidence:
-            if not e.get("success"):
-                continue
-            
-            result = e.get("result", {})
-            tool_name = e.get("tool_name")
-            
-            # Scam DB findings (highest weight - authoritative source)
-            if tool_name == "scam_db" and result.get("found"):
-                report_count = result.get("report_count", 0)
-                risk_score = result.get("risk_score", 0)
-                
-                # Higher weight for verified reports
-                if result.get("verified"):
-                    score += min(risk_score * 0.6, 50)  # Max 50 points for verified
-                    reasons.append(f"Verified scam in database ({report_count} reports)")
-                else:
-                    score += min(report_count * 5, 40)  # Max 40 points
-                    reasons.append(f"Found in scam database ({report_count} reports)")
-            
-            # Exa search results (web complaints and reports)
-            if tool_name == "exa_search":
-                results_list = result.get("results", [])
-                if results_list:
-                    result_count = len(results_list)
-                    score += min(result_count * 2, 20)  # Max 20 points
-                    reasons.append(f"Found {result_count} web complaints/reports")
-            
-            # Domain reputation (for URLs)
-            if tool_name == "domain_reputation":
-                risk_level = result.get("risk_level")
-                if risk_level == "high":
-                    score += 30
-                    reasons.append("Domain flagged as high risk")
-                elif risk_level == "medium":
-                    score += 15
-                    reasons.append("Domain flagged as medium risk")
-                
-                # Add points for young domain
-                age_days = result.get("age_days")
-                if age_days is not None and age_days < 30:
-                    score += 10
-                    reasons.append(f"Very new domain ({age_days} days old)")
-            
-            # Phone validator suspicious patterns
-            if tool_name == "phone_validator" and result.get("suspicious"):
-                score += 25
-                suspicious_reason = result.get("suspicious_reason", "Unknown")
-                reasons.append(f"Suspicious phone pattern: {suspicious_reason}")
+        score = heuristic.score
+        reasons = heuristic.reasons
         
         # Determine risk level based on score
-        if score >= 70:
-            risk_level = "high"
-            confidence = min(score, 100)
-        elif score >= 40:
-            risk_level = "medium"
-            confidence = min(score, 100)
-        else:
-            risk_level = "low"
+        risk_level = _SCORE_RISK_LEVELS[bisect.bisect_right(_SCORE_THRESHOLDS, score)]
+        if risk_level == "low":
             confidence = max(100 - score, 50)  # At least 50% confidence for low risk
+        else:
+            confidence = min(score, 100)
         
         # Build explanation
         if reasons:
@@ -487,22 +892,50 @@ Output your analysis in JSON format as specified above."""
         )
 
 
-# Singleton instance
-_reasoner_instance = None
+def _with_preamble(prompt: str) -> str:
+    """Prefix the static preamble unless the prompt already carries it."""
+    return prompt if prompt.startswith(_PROMPT_PREAMBLE) else _PROMPT_PREAMBLE + prompt
+
+
+def _is_prompt_cache_miss(exc: Exception) -> bool:
+    """Whether a Gemini call failed because its context cache is gone."""
+    from google.api_core import exceptions as google_exceptions
+    return isinstance(exc, google_exceptions.NotFound) or "expired" in str(exc).lower()
+
+
+# Reasoning prompt layout, parsed once at import. Only the slots vary per call.
+_PROMPT_PREAMBLE = f"{AgentReasoner.SYSTEM_PROMPT}\n\n---\n\n"
+_PROMPT_TEMPLATE = string.Template('''${preamble}OCR Text from Screenshot:
+"""${ocr}"""
 
+Entities Extracted:
+${entities}
+
+Evidence Collected:
+${evidence}
+
+---
+
+Based on the evidence above, determine:
+1. Risk level (low, medium, or high)
+2. Confidence score (0-100)
+3. Detailed explanation citing specific evidence
+
+Output your analysis in JSON format as specified above.''')
 
+
+@functools.cache
 def get_agent_reasoner(model: str = "gpt4o-mini") -> AgentReasoner:
     """
     Get singleton AgentReasoner instance.
     
+    The instance is created on first call and cached per model; use
+    get_agent_reasoner.cache_clear() to reset it.
+    
     Args:
         model: LLM model to use (gpt4o-mini, gpt4, or gemini)
     
     Returns:
         AgentReasoner instance
     """
-    global _reasoner_instance
-    if _reasoner_instance is None:
-        _reasoner_instance = AgentReasoner(model=model)
-    return _reasoner_instance
-
+    return AgentReasoner(model=model)
@@ -4,8 +4,10 @@ import os
 from pathlib import Path
 from celery import Celery
 from celery.signals import task_prerun, task_postrun, task_failure
+from kombu.serialization import register
 import logging
 from dotenv import load_dotenv
+import orjson
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent.parent / '.env'
@@ -14,6 +16,16 @@ load_dotenv(env_path)
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Register an orjson-backed serializer so producers can opt into faster
+# payload encoding (e.g. the load test); workers accept both formats.
+register(
+    'orjson',
+    orjson.dumps,
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='binary'
+)
+
 # Initialize Celery app
 celery_app = Celery(
     'typesafe_agent',
@@ -26,7 +38,7 @@ celery_app = Celery(
 celery_app.conf.update(
     # Serialization
     task_serializer='json',
-    accept_content=['json'],
+    accept_content=['json', 'orjson'],
     result_serializer='json',
     
     # Timezone
@@ -43,6 +55,8 @@ celery_app.conf.update(
     # Result backend
     result_expires=3600,  # Results expire after 1 hour
     result_extended=True,  # Store additional metadata
+    redis_socket_keepalive=True,  # Keep pooled backend sockets alive between tasks
+    redis_retry_on_timeout=True,
     
     # Retry configuration
     task_default_max_retries=3,
@@ -97,6 +97,21 @@ class Settings(BaseSettings):
         alias="EXA_MAX_RESULTS",
         description="Maximum number of Exa search results per query"
     )
+    gemini_prompt_cache: bool = Field(
+        default=False,
+        alias="GEMINI_PROMPT_CACHE",
+        description="Cache the agent reasoning preamble with Gemini context caching (Story 8.8)"
+    )
+    gemini_prompt_cache_ttl: int = Field(
+        default=3600,
+        alias="GEMINI_PROMPT_CACHE_TTL",
+        description="Gemini prompt cache TTL in seconds (default 1 hour)"
+    )
+    llm_max_concurrency: int = Field(
+        default=8,
+        alias="LLM_MAX_CONCURRENCY",
+        description="Maximum in-flight agent reasoning LLM calls per event loop (Story 8.8)"
+    )
     exa_daily_budget: float = Field(
         default=10.0,
         alias="EXA_DAILY_BUDGET",
@@ -12,7 +12,7 @@ from typing import Callable, Dict, Any
 
 from fastapi import FastAPI, Request, Response, HTTPException, File, Form, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field, field_validator
 import imghdr
 import asyncio
@@ -1269,7 +1269,8 @@ class ScamReportsListResponse(BaseModel):
     "/admin/scam-reports",
     response_model=ScamReportResponse,
     status_code=201,
-    tags=["admin"]
+    tags=["admin"],
+    response_class=ORJSONResponse
 )
 async def create_scam_report(request: CreateScamReportRequest, req: Request):
     """
@@ -1337,7 +1338,8 @@ async def create_scam_report(request: CreateScamReportRequest, req: Request):
 @app.get(
     "/admin/scam-reports",
     response_model=ScamReportsListResponse,
-    tags=["admin"]
+    tags=["admin"],
+    response_class=ORJSONResponse
 )
 async def list_scam_reports(
     req: Request,
@@ -1419,7 +1421,8 @@ async def list_scam_reports(
 @app.patch(
     "/admin/scam-reports/{report_id}",
     response_model=ScamReportResponse,
-    tags=["admin"]
+    tags=["admin"],
+    response_class=ORJSONResponse
 )
 async def update_scam_report(
     report_id: int,
@@ -1504,7 +1507,8 @@ async def update_scam_report(
 @app.delete(
     "/admin/scam-reports/{report_id}",
     response_model=ScamReportResponse,
-    tags=["admin"]
+    tags=["admin"],
+    response_class=ORJSONResponse
 )
 async def delete_scam_report(report_id: int, req: Request):
     """
@@ -1578,7 +1582,8 @@ class ScamAnalyticsResponse(BaseModel):
 @app.get(
     "/admin/scam-analytics",
     response_model=ScamAnalyticsResponse,
-    tags=["admin"]
+    tags=["admin"],
+    response_class=ORJSONResponse
 )
 async def get_scam_analytics(req: Request):
     """
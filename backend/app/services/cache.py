@@ -1,44 +1,70 @@
 """
 Simple in-memory cache with TTL support.
 """
+import array
 import hashlib
+import heapq
+import threading
 import time
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
 
 
 class TTLCache:
     """
     In-memory cache with time-to-live (TTL) expiration.
     
-    Uses SHA256 hash of content as cache key.
-    Implements simple time-based expiration without LRU.
+    Keys are a 16-byte BLAKE2s digest of the normalized text, so memory per
+    entry and key comparisons are independent of the text length.
+    Entries are kept in recency order, so eviction drops the least recently
+    used entry in O(1). Expiry times are tracked in a min-heap so expired
+    entries are purged lazily without scanning the whole cache. All mutations
+    happen under one lock, so instances can be shared across threads.
+    
+    Storage is preallocated: each key maps to a slot index into parallel
+    expiry (C double array) and value arrays, and slots are recycled on
+    eviction instead of allocating a tuple per entry.
     """
     
-    def __init__(self, ttl_seconds: int = 60, max_size: int = 100):
+    def __init__(
+        self,
+        ttl_seconds: int = 60,
+        max_size: int = 100,
+        time_func: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize cache with TTL and size limit.
         
         Args:
             ttl_seconds: Time-to-live for cache entries (default: 60s)
             max_size: Maximum number of entries (default: 100)
+            time_func: Clock returning seconds (default: time.monotonic)
         """
         self.ttl_seconds = ttl_seconds
         self.max_size = max_size
-        self._cache: Dict[str, tuple[Any, float]] = {}
+        self._time_func = time_func
+        # key -> slot index into _expiry/_values, in recency order
+        self._index: OrderedDict[bytes, int] = OrderedDict()
+        self._expiry = array.array('d', [0.0] * max_size)
+        self._values: list[Any] = [None] * max_size
+        self._free_slots: list[int] = list(range(max_size))
+        # (expires_at, key); may hold stale records for overwritten/evicted keys
+        self._expiry_heap: list[tuple[float, bytes]] = []
+        self._lock = threading.Lock()
     
-    def _generate_key(self, text: str) -> str:
+    def _generate_key(self, text: str) -> bytes:
         """
-        Generate cache key from text using SHA256 hash.
+        Generate cache key from text using a BLAKE2s digest.
         
         Args:
             text: Input text to hash
             
         Returns:
-            Hexadecimal hash string
+            16-byte digest of the normalized text
         """
-        # Normalize: lowercase and strip whitespace
-        normalized = text.lower().strip()
-        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        # Normalize: strip whitespace and lowercase
+        normalized = text.strip().lower()
+        return hashlib.blake2s(normalized.encode('utf-8'), digest_size=16).digest()
     
     def get(self, text: str) -> Optional[Dict[str, Any]]:
         """
@@ -52,17 +78,15 @@ class TTLCache:
         """
         key = self._generate_key(text)
         
-        if key not in self._cache:
-            return None
-        
-        value, timestamp = self._cache[key]
-        
-        # Check if expired
-        if time.time() - timestamp > self.ttl_seconds:
-            del self._cache[key]
-            return None
-        
-        return value
+        with self._lock:
+            self._purge_expired(self._time_func())
+            
+            slot = self._index.get(key)
+            if slot is None:
+                return None
+            
+            self._index.move_to_end(key)
+            return self._values[slot]
     
     def set(self, text: str, response: Dict[str, Any]) -> None:
         """
@@ -74,19 +98,73 @@ class TTLCache:
         """
         key = self._generate_key(text)
         
-        # Enforce max size by removing oldest entry
-        if len(self._cache) >= self.max_size and key not in self._cache:
-            # Remove oldest entry (first inserted)
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
+        with self._lock:
+            now = self._time_func()
+            self._purge_expired(now)
+            
+            slot = self._index.get(key)
+            if slot is not None:
+                self._index.move_to_end(key)
+            else:
+                if not self._free_slots:
+                    # Evict least recently used entry and reuse its slot
+                    self._release(self._index.popitem(last=False)[1])
+                slot = self._free_slots.pop()
+                self._index[key] = slot
+            
+            expires_at = now + self.ttl_seconds
+            self._expiry[slot] = expires_at
+            self._values[slot] = response
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            
+            # Drop stale heap records once they outnumber live entries
+            if len(self._expiry_heap) > 2 * self.max_size:
+                self._expiry_heap = [
+                    (self._expiry[s], k) for k, s in self._index.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+    
+    def _release(self, slot: int) -> None:
+        """
+        Return a slot to the free list, dropping its value reference.
+        
+        Caller must hold self._lock.
+        
+        Args:
+            slot: Slot index no longer mapped by any key
+        """
+        self._values[slot] = None
+        self._free_slots.append(slot)
+    
+    def _purge_expired(self, now: float) -> None:
+        """
+        Remove entries whose TTL has elapsed, soonest-expiring first.
+        
+        Caller must hold self._lock.
         
-        self._cache[key] = (response, time.time())
+        Args:
+            now: Current monotonic time
+        """
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            slot = self._index.get(key)
+            # Skip records superseded by a later set() of the same key
+            if slot is not None and self._expiry[slot] == expires_at:
+                del self._index[key]
+                self._release(slot)
     
     def clear(self) -> None:
         """Clear all cache entries."""
-        self._cache.clear()
+        with self._lock:
+            self._index.clear()
+            self._expiry_heap.clear()
+            self._values = [None] * self.max_size
+            self._free_slots = list(range(self.max_size))
     
     def size(self) -> int:
         """Return current cache size."""
-        return len(self._cache)
+        with self._lock:
+            self._purge_expired(self._time_func())
+            return len(self._index)
 
@@ -22,6 +22,15 @@ _model: Optional[genai.GenerativeModel] = None
 # Image size limit (4MB)
 MAX_IMAGE_SIZE = 4 * 1024 * 1024
 
+# Model name and safety settings shared by every Gemini model we build
+GEMINI_MODEL_NAME = 'models/gemini-2.5-flash'
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
 
 def get_model() -> genai.GenerativeModel:
     """
@@ -44,13 +53,8 @@ def get_model() -> genai.GenerativeModel:
         
         # Initialize model with safety settings
         _model = genai.GenerativeModel(
-            model_name='models/gemini-2.5-flash',
-            safety_settings={
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
+            model_name=GEMINI_MODEL_NAME,
+            safety_settings=SAFETY_SETTINGS
         )
         logger.info("Gemini model initialized")
     
@@ -30,6 +30,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Verified reports scoring above this stay in scam_reports however old they are
+KEEP_VERIFIED_MIN_RISK = 70
+
+# PostgREST filter matching every report that is NOT verified-and-high-risk
+# (a null flag or score counts as unverified / zero)
+ARCHIVABLE_FILTER = (
+    'verified.is.false,verified.is.null,'
+    f'risk_score.lte.{KEEP_VERIFIED_MIN_RISK},risk_score.is.null'
+)
+
 
 class ScamArchiver:
     """Handles archiving of old scam reports."""
@@ -66,32 +76,17 @@ class ScamArchiver:
             
             logger.info(f"Cutoff date: {cutoff_date}")
             
-            # Query for old reports
-            # Note: We'll be more conservative with verified reports
+            # Query for old reports, minus verified high-risk ones (they're
+            # still valuable). The database applies ARCHIVABLE_FILTER, so the
+            # reports being kept are never transferred.
             response = self.supabase.table('scam_reports').select('*').lt(
                 'last_reported', cutoff_date
-            ).execute()
+            ).or_(ARCHIVABLE_FILTER).execute()
             
-            candidates = response.data or []
-            
-            # Filter: Keep verified high-risk reports, archive others
-            archival_candidates = []
-            for report in candidates:
-                # Keep verified reports with high risk scores (they're still valuable)
-                if report.get('verified') and report.get('risk_score', 0) > 70:
-                    logger.debug(
-                        f"Keeping verified high-risk report: "
-                        f"{report['entity_type']}/{report['entity_value']}"
-                    )
-                    continue
-                
-                archival_candidates.append(report)
+            archival_candidates = response.data or []
             
             self.stats['candidates'] = len(archival_candidates)
-            logger.info(
-                f"Found {len(candidates)} old reports total, "
-                f"{len(archival_candidates)} eligible for archival"
-            )
+            logger.info(f"Found {len(archival_candidates)} old reports eligible for archival")
             
             return archival_candidates
         
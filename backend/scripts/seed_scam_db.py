@@ -17,7 +17,8 @@ import httpx
 import csv
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from contextlib import nullcontext
+from typing import List, Dict, Any, Iterable, Optional, TextIO, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -30,6 +31,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Connection pool for PhishTank downloads, reused across fetches
+PHISHTANK_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+PHISHTANK_HTTP_TIMEOUT = 60.0
+
 
 class ScamDatabaseSeeder:
     """Main seeder class for populating scam database."""
@@ -45,6 +50,22 @@ class ScamDatabaseSeeder:
             'manual_added': 0,
             'errors': 0
         }
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled PhishTank HTTP client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=PHISHTANK_HTTP_LIMITS,
+                timeout=PHISHTANK_HTTP_TIMEOUT
+            )
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     async def seed_from_phishtank(self, limit: Optional[int] = None) -> None:
         """
@@ -58,14 +79,14 @@ class ScamDatabaseSeeder:
         logger.info("=" * 80)
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                # PhishTank free API endpoint (no key required for verified data)
-                response = await client.get(
-                    "http://data.phishtank.com/data/online-valid.json",
-                    follow_redirects=True
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = self._get_http_client()
+            # PhishTank free API endpoint (no key required for verified data)
+            response = await client.get(
+                "http://data.phishtank.com/data/online-valid.json",
+                follow_redirects=True
+            )
+            response.raise_for_status()
+            data = response.json()
             
             total_entries = len(data)
             logger.info(f"Fetched {total_entries} PhishTank entries")
@@ -134,7 +155,7 @@ class ScamDatabaseSeeder:
             logger.error(f"Fatal error fetching PhishTank data: {e}", exc_info=True)
             raise
     
-    def seed_from_ftc_csv(self, csv_path: str) -> None:
+    def seed_from_ftc_csv(self, csv_path: Union[str, TextIO]) -> None:
         """
         Seed from FTC Consumer Sentinel CSV data.
         
@@ -145,65 +166,26 @@ class ScamDatabaseSeeder:
         - description: Optional description
         
         Args:
-            csv_path: Path to FTC CSV file
+            csv_path: Path to FTC CSV file, or an already-open text stream
+                (anything with a ``read`` method), which is left open
         """
-        csv_file = Path(csv_path)
+        is_stream = hasattr(csv_path, 'read')
+        source_name = getattr(csv_path, 'name', '<stream>') if is_stream else csv_path
         
-        if not csv_file.exists():
+        if not is_stream and not Path(csv_path).exists():
             logger.warning(f"FTC CSV file not found: {csv_path}")
             return
         
         logger.info("=" * 80)
-        logger.info(f"Reading FTC data from {csv_path}")
+        logger.info(f"Reading FTC data from {source_name}")
         logger.info("=" * 80)
         
         try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for i, row in enumerate(reader, 1):
-                    try:
-                        phone = row.get('phone_number')
-                        complaint_type = row.get('complaint_type', 'Unknown')
-                        date = row.get('date', datetime.now().isoformat())
-                        description = row.get('description', '')
-                        
-                        if not phone:
-                            continue
-                        
-                        # Create evidence
-                        evidence = {
-                            "source": "FTC Consumer Sentinel",
-                            "complaint_type": complaint_type,
-                            "date": date,
-                            "description": description[:200] if description else None
-                        }
-                        
-                        # Add to database
-                        success = self.tool.add_report(
-                            entity_type="phone",
-                            entity_value=phone,
-                            evidence=evidence,
-                            notes=f"FTC report: {complaint_type}"
-                        )
-                        
-                        if success:
-                            self.stats['ftc_added'] += 1
-                        else:
-                            self.stats['ftc_duplicates'] += 1
-                        
-                        # Progress reporting
-                        if i % 100 == 0:
-                            logger.info(
-                                f"Progress: {i} processed | "
-                                f"Added: {self.stats['ftc_added']} | "
-                                f"Duplicates: {self.stats['ftc_duplicates']}"
-                            )
-                    
-                    except Exception as e:
-                        logger.error(f"Error processing FTC row {i}: {e}")
-                        self.stats['errors'] += 1
-                        continue
+            with (
+                nullcontext(csv_path) if is_stream
+                else open(csv_path, 'r', encoding='utf-8')
+            ) as f:
+                self._ingest_ftc_rows(csv.DictReader(f))
             
             logger.info("=" * 80)
             logger.info(
@@ -215,6 +197,57 @@ class ScamDatabaseSeeder:
         except Exception as e:
             logger.error(f"Error reading FTC CSV: {e}", exc_info=True)
     
+    def _ingest_ftc_rows(self, rows: Iterable[Dict[str, str]]) -> None:
+        """
+        Add FTC complaint rows to the database, updating ftc_* stats.
+        
+        Args:
+            rows: Parsed CSV rows keyed by column name (see seed_from_ftc_csv)
+        """
+        for i, row in enumerate(rows, 1):
+            try:
+                phone = row.get('phone_number')
+                complaint_type = row.get('complaint_type', 'Unknown')
+                date = row.get('date', datetime.now().isoformat())
+                description = row.get('description', '')
+                
+                if not phone:
+                    continue
+                
+                # Create evidence
+                evidence = {
+                    "source": "FTC Consumer Sentinel",
+                    "complaint_type": complaint_type,
+                    "date": date,
+                    "description": description[:200] if description else None
+                }
+                
+                # Add to database
+                success = self.tool.add_report(
+                    entity_type="phone",
+                    entity_value=phone,
+                    evidence=evidence,
+                    notes=f"FTC report: {complaint_type}"
+                )
+                
+                if success:
+                    self.stats['ftc_added'] += 1
+                else:
+                    self.stats['ftc_duplicates'] += 1
+                
+                # Progress reporting
+                if i % 100 == 0:
+                    logger.info(
+                        f"Progress: {i} processed | "
+                        f"Added: {self.stats['ftc_added']} | "
+                        f"Duplicates: {self.stats['ftc_duplicates']}"
+                    )
+            
+            except Exception as e:
+                logger.error(f"Error processing FTC row {i}: {e}")
+                self.stats['errors'] += 1
+                continue
+    
     def seed_manual_data(self) -> None:
         """
         Seed additional manual/curated scam data.
@@ -402,6 +435,8 @@ async def main():
         logger.error(f"Fatal error during seeding: {e}", exc_info=True)
         seeder.print_summary()
         sys.exit(1)
+    finally:
+        await seeder.aclose()
 
 
 if __name__ == "__main__":
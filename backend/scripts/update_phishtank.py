@@ -17,7 +17,7 @@ import httpx
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from app.agents.tools.scam_database import get_scam_database_tool
 
@@ -32,6 +32,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Connection pool for PhishTank downloads, reused across fetches
+PHISHTANK_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+PHISHTANK_HTTP_TIMEOUT = 60.0
+
 
 class PhishTankUpdater:
     """Handles daily PhishTank updates."""
@@ -47,6 +51,22 @@ class PhishTankUpdater:
             'skipped': 0,
             'errors': 0
         }
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the pooled PhishTank HTTP client, creating it on first use."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=PHISHTANK_HTTP_LIMITS,
+                timeout=PHISHTANK_HTTP_TIMEOUT
+            )
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one was opened."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
     
     async def fetch_recent_entries(self, hours: int = 48) -> List[Dict[str, Any]]:
         """
@@ -61,13 +81,13 @@ class PhishTankUpdater:
         logger.info("Fetching latest PhishTank data...")
         
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.get(
-                    "http://data.phishtank.com/data/online-valid.json",
-                    follow_redirects=True
-                )
-                response.raise_for_status()
-                data = response.json()
+            client = self._get_http_client()
+            response = await client.get(
+                "http://data.phishtank.com/data/online-valid.json",
+                follow_redirects=True
+            )
+            response.raise_for_status()
+            data = response.json()
             
             self.stats['total_fetched'] = len(data)
             logger.info(f"Fetched {len(data)} total PhishTank entries")
@@ -236,6 +256,8 @@ async def main():
         logger.error(f"Fatal error during update: {e}", exc_info=True)
         updater.print_summary()
         sys.exit(1)
+    finally:
+        await updater.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""
+Shared pytest configuration for TypeSafe backend tests.
+
+Imports the heavy agent modules (google.generativeai, openai, celery) once
+at session start so their import cost is paid up front rather than inside
+whichever test module happens to be collected first.
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # e.g. Windows, where uvloop is unavailable
+    uvloop = None
+
+import app.agents.reasoning  # noqa: F401  warm imports
+import app.services.cache  # noqa: F401
+import app.agents.tasks.example_task  # noqa: F401
+from app.agents.worker import celery_app
+
+# Leave pytest's logging handlers in place for in-process workers
+celery_app.conf.worker_hijack_root_logger = False
+
+
+@pytest.fixture(scope="session", autouse=True)
+def uvloop_event_loop_policy():
+    """Run async tests on uvloop, as uvicorn does, when it is installed."""
+    if uvloop is None:
+        yield
+        return
+    
+    previous_policy = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    yield
+    asyncio.set_event_loop_policy(previous_policy)
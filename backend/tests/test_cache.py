@@ -1,12 +1,25 @@
 """
 Tests for TTL cache implementation.
 """
-import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 
 from app.services.cache import TTLCache
 
 
+class Clock:
+    """Manually advanced clock for deterministic TTL tests."""
+    
+    def __init__(self, now: float = 0.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def tick(self, seconds: float) -> None:
+        self.now += seconds
+
+
 class TestTTLCache:
     """Test suite for TTLCache."""
     
@@ -55,20 +68,41 @@ class TestTTLCache:
     
     def test_cache_ttl_expiration(self):
         """Test cache entries expire after TTL."""
-        cache = TTLCache(ttl_seconds=1)  # 1 second TTL
+        clock = Clock()
+        cache = TTLCache(ttl_seconds=1, time_func=clock)  # 1 second TTL
         
         cache.set("expire_test", {"risk_level": "medium"})
         
         # Should exist immediately
         assert cache.get("expire_test") is not None
         
-        # Wait for expiration
-        time.sleep(1.1)
+        # Advance past expiration
+        clock.tick(1.1)
         
         # Should be expired
         assert cache.get("expire_test") is None
         assert cache.size() == 0
     
+    def test_cache_reset_entry_outlives_original_expiry(self):
+        """Test re-setting a key extends its lifetime past the first expiry."""
+        clock = Clock(100.0)
+        cache = TTLCache(ttl_seconds=10, time_func=clock)
+        
+        cache.set("refresh_test", {"risk_level": "low"})
+        cache.set("other", {"risk_level": "high"})
+        
+        clock.tick(5)
+        cache.set("refresh_test", {"risk_level": "medium"})
+        
+        # Past the first expiry (110) but before the refreshed one (115)
+        clock.tick(7)
+        assert cache.size() == 1
+        assert cache.get("refresh_test") == {"risk_level": "medium"}
+        assert cache.get("other") is None
+        
+        clock.tick(4)
+        assert cache.size() == 0
+    
     def test_cache_max_size_enforcement(self):
         """Test cache enforces max size limit."""
         cache = TTLCache(max_size=3)
@@ -87,6 +121,42 @@ class TestTTLCache:
         assert cache.get("text1") is None  # Oldest should be evicted
         assert cache.get("text4") is not None  # Newest should exist
     
+    def test_cache_evicts_least_recently_used(self):
+        """Test eviction order follows access recency, not insertion."""
+        cache = TTLCache(max_size=3)
+        
+        cache.set("text1", {"risk_level": "low"})
+        cache.set("text2", {"risk_level": "medium"})
+        cache.set("text3", {"risk_level": "high"})
+        
+        # Touch text1 so text2 becomes least recently used
+        assert cache.get("text1") is not None
+        
+        cache.set("text4", {"risk_level": "low"})
+        
+        assert cache.size() == 3
+        assert cache.get("text2") is None
+        assert cache.get("text1") is not None
+        assert cache.get("text3") is not None
+        assert cache.get("text4") is not None
+    
+    def test_cache_reuses_slots_after_eviction_and_expiry(self):
+        """Test evicted and expired entries hand their slots back for reuse."""
+        clock = Clock()
+        cache = TTLCache(ttl_seconds=1, max_size=3, time_func=clock)
+
+        for i in range(5):
+            cache.set(f"text{i}", {"n": i})
+
+        assert cache.size() == 3
+        assert sorted(cache._index.values()) == [0, 1, 2]
+        assert cache.get("text4") == {"n": 4}
+
+        clock.tick(1.1)
+        assert cache.size() == 0
+        assert sorted(cache._free_slots) == [0, 1, 2]
+        assert cache._values == [None, None, None]
+
     def test_cache_update_existing_key(self):
         """Test updating existing cache entry doesn't increase size."""
         cache = TTLCache(max_size=5)
@@ -126,4 +196,19 @@ class TestTTLCache:
         assert cache.get("text one")["risk_level"] == "low"
         assert cache.get("text two")["risk_level"] == "high"
         assert cache.size() == 2
-
+    
+    def test_cache_concurrent_access(self):
+        """Test concurrent set/get from many threads keeps the cache consistent."""
+        cache = TTLCache(max_size=50)
+        
+        def worker(worker_id):
+            for i in range(500):
+                key = f"text{(worker_id * 7 + i) % 120}"
+                cache.set(key, {"risk_level": "low", "n": i})
+                cache.get(key)
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(worker, range(8)))
+        
+        assert cache.size() == 50
+        assert len(cache._expiry_heap) <= 2 * cache.max_size
@@ -7,6 +7,22 @@ from app.agents.tasks.example_task import example_agent_task
 import time
 
 
+@pytest.fixture
+def no_task_sleep(monkeypatch):
+    """Skip the simulated work delays inside example_agent_task"""
+    monkeypatch.setattr('app.agents.tasks.example_task.time.sleep', lambda *args, **kwargs: None)
+
+
+@pytest.fixture(scope="class")
+def celery_eager_mode():
+    """Configure Celery to run tasks synchronously in eager mode"""
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_eager_propagates = True
+    yield
+    celery_app.conf.task_always_eager = False
+    celery_app.conf.task_eager_propagates = False
+
+
 class TestCeleryConfiguration:
     """Test Celery worker configuration"""
     
@@ -22,6 +38,7 @@ class TestCeleryConfiguration:
         # Serialization
         assert config.task_serializer == 'json'
         assert 'json' in config.accept_content
+        assert 'orjson' in config.accept_content
         assert config.result_serializer == 'json'
         
         # Timezone
@@ -51,17 +68,13 @@ class TestCeleryConfiguration:
         assert 'redis://' in celery_app.conf.result_backend
 
 
+@pytest.mark.usefixtures("celery_eager_mode")
 class TestExampleTask:
     """Test example_agent_task functionality"""
     
-    @pytest.fixture
-    def celery_eager_mode(self):
-        """Configure Celery to run tasks synchronously in eager mode"""
-        celery_app.conf.task_always_eager = True
-        celery_app.conf.task_eager_propagates = True
-        yield
-        celery_app.conf.task_always_eager = False
-        celery_app.conf.task_eager_propagates = False
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, no_task_sleep):
+        """Apply no_task_sleep to every test in this class"""
     
     def test_task_registration(self):
         """Test that example task is registered"""
@@ -73,8 +86,7 @@ class TestExampleTask:
         assert task.max_retries == 3
         assert task.default_retry_delay == 2
     
-    @patch('app.agents.tasks.example_task.time.sleep')
-    def test_task_success(self, mock_sleep, celery_eager_mode):
+    def test_task_success(self):
         """Test successful task execution in eager mode"""
         task_id = "test-123"
         data = {"key": "value", "simulate_failure": False}
@@ -90,9 +102,8 @@ class TestExampleTask:
         assert result_data['result'] == 'Success'
         assert result_data['attempts'] >= 1
     
-    @patch('app.agents.tasks.example_task.time.sleep')
     @patch('app.agents.tasks.example_task.random.random', return_value=0.05)
-    def test_task_retry_logic(self, mock_random, mock_sleep, celery_eager_mode):
+    def test_task_retry_logic(self, mock_random):
         """Test task retry on failure (simulated)"""
         task_id = "test-456"
         data = {"key": "value", "simulate_failure": True}
@@ -118,8 +129,7 @@ class TestExampleTask:
         assert result.id == task_id
         assert result.state in ['PENDING', 'SUCCESS', 'STARTED']
     
-    @patch('app.agents.tasks.example_task.time.sleep')
-    def test_task_result_structure(self, mock_sleep, celery_eager_mode):
+    def test_task_result_structure(self):
         """Test task result has expected structure"""
         task_id = "test-result-structure"
         data = {"test": "data"}
@@ -150,32 +160,24 @@ class TestTaskStatusRetrieval:
         # State should be PENDING for non-existent task
         assert result.state in ['PENDING', 'SUCCESS', 'FAILURE']
     
-    @patch('app.agents.tasks.example_task.time.sleep')
-    def test_get_task_result(self, mock_sleep):
+    @pytest.mark.usefixtures("celery_eager_mode")
+    def test_get_task_result(self, no_task_sleep):
         """Test getting task result after completion"""
         task_id = "test-get-result"
         data = {"key": "value"}
         
-        # Configure eager mode
-        celery_app.conf.task_always_eager = True
-        celery_app.conf.task_eager_propagates = True
-        
-        try:
-            # Execute task
-            result = example_agent_task.apply_async(
-                args=[task_id, data],
-                task_id=task_id
-            )
-            
-            # Get result
-            task_result = result.get(timeout=5)
-            
-            assert task_result is not None
-            assert task_result['task_id'] == task_id
-            assert result.successful()
-        finally:
-            celery_app.conf.task_always_eager = False
-            celery_app.conf.task_eager_propagates = False
+        # Execute task
+        result = example_agent_task.apply_async(
+            args=[task_id, data],
+            task_id=task_id
+        )
+        
+        # Get result
+        task_result = result.get(timeout=5)
+        
+        assert task_result is not None
+        assert task_result['task_id'] == task_id
+        assert result.successful()
 
 
 class TestWorkerHealthCheck:
@@ -12,170 +12,345 @@ Story: 8.12 - Database Seeding & Maintenance
 
 import pytest
 import asyncio
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
+import io
+import logging
+import tracemalloc
+from unittest.mock import Mock, patch, AsyncMock, MagicMock, create_autospec
 from datetime import datetime, timedelta, timezone
-import json
+from types import SimpleNamespace
+
+import httpx
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from app.agents.tools.scam_database import get_scam_database_tool
+
+from app.main import app
+from scripts.archive_old_scams import ScamArchiver
+from scripts.seed_scam_db import ScamDatabaseSeeder
+from scripts.update_phishtank import PhishTankUpdater
+
+
+@pytest.fixture(scope="module")
+def event_loop():
+    """Share one event loop across this module instead of one per test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+async def async_client():
+    """One in-process httpx client for every admin test, on the shared loop.
+    
+    ASGITransport calls the app directly, without TestClient's thread portal,
+    and does not run the startup hook that validates API keys.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test"
+    ) as c:
+        yield c
+
+
+# Canonical scam_reports rows shared by the archiver and admin tests: two
+# phones and a URL, where only the URL is verified high-risk (kept from archival)
+_SAMPLE_REPORTS = [
+    {
+        'id': 1,
+        'entity_type': 'phone',
+        'entity_value': '+18005551234',
+        'risk_score': 85.0,
+        'report_count': 10,
+        'verified': False,
+        'last_reported': '2024-01-01T00:00:00+00:00',
+        'created_at': '2025-10-18T10:00:00+00:00'
+    },
+    {
+        'id': 2,
+        'entity_type': 'url',
+        'entity_value': 'scam.com',
+        'risk_score': 95.0,
+        'report_count': 50,
+        'verified': True,
+        'last_reported': '2024-01-01T00:00:00+00:00',
+        'created_at': '2025-10-17T10:00:00+00:00'
+    },
+    {
+        'id': 3,
+        'entity_type': 'phone',
+        'entity_value': '+18005555678',
+        'risk_score': 30.0,
+        'report_count': 2,
+        'verified': False,
+        'last_reported': '2024-01-01T00:00:00+00:00',
+        'created_at': '2025-10-16T10:00:00+00:00'
+    }
+]
+
+# The first sample report after an admin verifies it as high-risk
+_VERIFIED_REPORT = {**_SAMPLE_REPORTS[0], 'verified': True, 'risk_score': 95.0}
+
+
+@pytest.fixture(scope="module")
+def sample_reports():
+    """The canonical sample reports; code under test only reads them."""
+    return _SAMPLE_REPORTS
+
+
+# Fixed "current time" for tests whose outcome depends on the wall clock
+NOW = datetime(2025, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() is always NOW."""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return NOW.astimezone(tz) if tz else NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Freeze datetime.now() at NOW inside the updater and archiver scripts."""
+    monkeypatch.setattr('scripts.update_phishtank.datetime', FrozenDatetime)
+    monkeypatch.setattr('scripts.archive_old_scams.datetime', FrozenDatetime)
+    return NOW
+
+
+def make_httpx_mock(payload):
+    """Build an httpx.AsyncClient stand-in whose get() responds with payload."""
+    m = AsyncMock()
+    m.get.return_value = SimpleNamespace(json=lambda: payload, raise_for_status=lambda: None)
+    return m
+
+
+@pytest.fixture
+def mock_httpx(monkeypatch):
+    """Install make_httpx_mock(payload) as httpx.AsyncClient; returns the mock."""
+    def install(payload):
+        client = make_httpx_mock(payload)
+        monkeypatch.setattr('httpx.AsyncClient', lambda *args, **kwargs: client)
+        return client
+    return install
+
+
+@pytest.fixture
+def mock_scam_tool(monkeypatch):
+    """Patch get_scam_database_tool for the seeding scripts.
+    
+    Returns (mock_tool, mock_tool_instance); add_report succeeds by default.
+    """
+    mock_tool_instance = Mock()
+    mock_tool_instance.add_report.return_value = True
+    mock_tool = create_autospec(get_scam_database_tool, return_value=mock_tool_instance)
+    monkeypatch.setattr('scripts.seed_scam_db.get_scam_database_tool', mock_tool)
+    monkeypatch.setattr('scripts.update_phishtank.get_scam_database_tool', mock_tool)
+    return mock_tool, mock_tool_instance
+
+
+@pytest.fixture
+def mock_archive_supabase(monkeypatch):
+    """Patch the archiver's Supabase client; returns the client MagicMock."""
+    mock_client = MagicMock()
+    monkeypatch.setattr('scripts.archive_old_scams.get_supabase_client', lambda: mock_client)
+    return mock_client
+
+
+FTC_CSV = """phone_number,complaint_type,date,description
++18005551234,IRS Scam,2025-10-01,Claimed to be IRS demanding payment
++18005555678,Tech Support,2025-10-02,Fake Microsoft tech support
+"""
+
+FTC_ROWS = [
+    {
+        'phone_number': '+18005551234',
+        'complaint_type': 'IRS Scam',
+        'date': '2025-10-01',
+        'description': 'Claimed to be IRS demanding payment'
+    },
+    {
+        'phone_number': '+18005555678',
+        'complaint_type': 'Tech Support',
+        'date': '2025-10-02',
+        'description': 'Fake Microsoft tech support'
+    }
+]
+
 
 # Test seeding functionality
+@pytest.mark.seeding
+@pytest.mark.xdist_group("seeding")
 class TestScamDatabaseSeeder:
     """Test seeding scripts."""
     
-    @pytest.mark.asyncio
-    async def test_phishtank_seeding(self):
-        """Test PhishTank data seeding."""
-        from scripts.seed_scam_db import ScamDatabaseSeeder
-        
-        # Mock PhishTank API response
-        mock_phishtank_data = [
-            {
-                'phish_id': '12345',
-                'url': 'http://scam-site.com/login',
-                'submission_time': '2025-10-18T10:00:00+00:00',
-                'verified': 'yes'
-            },
-            {
-                'phish_id': '12346',
-                'url': 'http://fake-bank.com',
-                'submission_time': '2025-10-18T11:00:00+00:00',
-                'verified': 'yes'
-            }
+    @pytest.fixture(scope="class")
+    def shared_seeder(self):
+        """Build one seeder for the class, without touching the real database tool."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr('scripts.seed_scam_db.get_scam_database_tool', Mock())
+            return ScamDatabaseSeeder()
+    
+    @pytest.fixture
+    def seeder(self, shared_seeder, mock_scam_tool):
+        """The class's seeder, wired to this test's mock tool with zeroed stats."""
+        _, mock_tool_instance = mock_scam_tool
+        shared_seeder.tool = mock_tool_instance
+        shared_seeder.stats = dict.fromkeys(shared_seeder.stats, 0)
+        # Drop any pooled client, so each test's mock_httpx takes effect
+        shared_seeder._http = None
+        return shared_seeder
+    
+    @pytest.mark.parametrize(
+        "source,payload,duplicate,expected_added,expected_dups,first_call",
+        [
+            pytest.param(
+                "phishtank",
+                [
+                    {
+                        'phish_id': '12345',
+                        'url': 'http://scam-site.com/login',
+                        'submission_time': '2025-10-18T10:00:00+00:00',
+                        'verified': 'yes'
+                    },
+                    {
+                        'phish_id': '12346',
+                        'url': 'http://fake-bank.com',
+                        'submission_time': '2025-10-18T11:00:00+00:00',
+                        'verified': 'yes'
+                    }
+                ],
+                False, 2, 0,
+                ('url', 'http://scam-site.com/login', 'PhishTank'),
+                id="phishtank"
+            ),
+            pytest.param(
+                "phishtank",
+                [
+                    {
+                        'phish_id': '1',
+                        'url': 'http://scam.com',
+                        'submission_time': '2025-10-18T10:00:00+00:00',
+                        'verified': 'yes'
+                    }
+                ],
+                True, 0, 1,
+                ('url', 'http://scam.com', 'PhishTank'),
+                id="phishtank-duplicate"
+            ),
+            pytest.param(
+                "ftc",
+                FTC_ROWS,
+                False, 2, 0,
+                ('phone', '+18005551234', 'FTC Consumer Sentinel'),
+                id="ftc"
+            ),
         ]
+    )
+    async def test_seeding(
+        self, mock_httpx, mock_scam_tool, seeder,
+        source, payload, duplicate, expected_added, expected_dups, first_call
+    ):
+        """Test PhishTank and FTC seeding count added reports and duplicates."""
+        _, mock_tool_instance = mock_scam_tool
+        # Record each report; add_report returns False for one that exists
+        captured = []
+        mock_tool_instance.add_report.side_effect = (
+            lambda **kw: captured.append(kw) or not duplicate
+        )
         
-        with patch('httpx.AsyncClient') as mock_client:
-            # Mock the HTTP response
-            mock_response = Mock()
-            mock_response.json.return_value = mock_phishtank_data
-            mock_response.raise_for_status = Mock()
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
-            
-            # Mock the scam database tool
-            with patch('scripts.seed_scam_db.get_scam_database_tool') as mock_tool:
-                mock_tool_instance = Mock()
-                mock_tool_instance.add_report.return_value = True
-                mock_tool.return_value = mock_tool_instance
-                
-                seeder = ScamDatabaseSeeder()
-                await seeder.seed_from_phishtank(limit=2)
-                
-                # Verify stats
-                assert seeder.stats['phishtank_added'] == 2
-                assert seeder.stats['phishtank_duplicates'] == 0
-                
-                # Verify add_report was called correctly
-                assert mock_tool_instance.add_report.call_count == 2
-                
-                # Check first call
-                first_call = mock_tool_instance.add_report.call_args_list[0]
-                assert first_call[1]['entity_type'] == 'url'
-                assert 'scam-site.com' in first_call[1]['entity_value']
-                assert first_call[1]['evidence']['source'] == 'PhishTank'
+        if source == "phishtank":
+            mock_httpx(payload)
+            await seeder.seed_from_phishtank(limit=len(payload))
+        else:
+            # Rows as csv.DictReader yields them, skipping the CSV parse
+            seeder._ingest_ftc_rows(payload)
+        
+        # Verify stats
+        assert seeder.stats[f'{source}_added'] == expected_added
+        assert seeder.stats[f'{source}_duplicates'] == expected_dups
+        assert len(captured) == expected_added + expected_dups
+        
+        # Check first call
+        entity_type, entity_value, evidence_source = first_call
+        assert captured[0]['entity_type'] == entity_type
+        assert captured[0]['entity_value'] == entity_value
+        assert captured[0]['evidence']['source'] == evidence_source
     
-    @pytest.mark.asyncio
-    async def test_phishtank_duplicate_handling(self):
-        """Test that duplicates are handled correctly."""
-        from scripts.seed_scam_db import ScamDatabaseSeeder
+    async def test_phishtank_client_pooled_and_reused(self, seeder, monkeypatch):
+        """Test PhishTank fetches share one pooled httpx client until aclose()."""
+        client = make_httpx_mock([])
+        client_cls = Mock(return_value=client)
+        monkeypatch.setattr('httpx.AsyncClient', client_cls)
         
-        mock_data = [
-            {
-                'phish_id': '1',
-                'url': 'http://scam.com',
-                'submission_time': '2025-10-18T10:00:00+00:00',
-                'verified': 'yes'
-            }
-        ]
+        await seeder.seed_from_phishtank()
+        await seeder.seed_from_phishtank()
+        await seeder.aclose()
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.json.return_value = mock_data
-            mock_response.raise_for_status = Mock()
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
-            
-            with patch('scripts.seed_scam_db.get_scam_database_tool') as mock_tool:
-                mock_tool_instance = Mock()
-                # Return False to simulate duplicate
-                mock_tool_instance.add_report.return_value = False
-                mock_tool.return_value = mock_tool_instance
-                
-                seeder = ScamDatabaseSeeder()
-                await seeder.seed_from_phishtank(limit=1)
-                
-                assert seeder.stats['phishtank_added'] == 0
-                assert seeder.stats['phishtank_duplicates'] == 1
+        client_cls.assert_called_once()
+        limits = client_cls.call_args.kwargs['limits']
+        assert limits.max_connections == 100
+        assert limits.max_keepalive_connections == 20
+        assert client.get.await_count == 2
+        client.aclose.assert_awaited_once()
     
-    def test_ftc_csv_seeding(self, tmp_path):
-        """Test FTC CSV data seeding."""
-        from scripts.seed_scam_db import ScamDatabaseSeeder
+    def test_ftc_csv_stream_parsed_into_rows(self, seeder):
+        """Test seed_from_ftc_csv parses the CSV into the rows it ingests."""
+        with patch.object(seeder, '_ingest_ftc_rows') as mock_ingest:
+            seeder.seed_from_ftc_csv(io.StringIO(FTC_CSV))
+            rows = list(mock_ingest.call_args[0][0])
         
-        # Create test CSV file
-        csv_content = """phone_number,complaint_type,date,description
-+18005551234,IRS Scam,2025-10-01,Claimed to be IRS demanding payment
-+18005555678,Tech Support,2025-10-02,Fake Microsoft tech support
-"""
-        csv_file = tmp_path / "test_ftc.csv"
-        csv_file.write_text(csv_content)
-        
-        with patch('scripts.seed_scam_db.get_scam_database_tool') as mock_tool:
-            mock_tool_instance = Mock()
-            mock_tool_instance.add_report.return_value = True
-            mock_tool.return_value = mock_tool_instance
-            
-            seeder = ScamDatabaseSeeder()
-            seeder.seed_from_ftc_csv(str(csv_file))
-            
-            # Verify stats
-            assert seeder.stats['ftc_added'] == 2
-            assert seeder.stats['ftc_duplicates'] == 0
-            
-            # Verify calls
-            assert mock_tool_instance.add_report.call_count == 2
-            
-            # Check first call
-            first_call = mock_tool_instance.add_report.call_args_list[0]
-            assert first_call[1]['entity_type'] == 'phone'
-            assert first_call[1]['entity_value'] == '+18005551234'
-            assert 'FTC Consumer Sentinel' in first_call[1]['evidence']['source']
+        assert rows == FTC_ROWS
     
-    def test_manual_data_seeding(self):
+    @pytest.mark.slow
+    def test_ftc_csv_seeding_streams_rows(self, seeder, caplog):
+        """Test a large FTC CSV is seeded row by row without buffering it."""
+        rows = 20_000
+        csv_stream = io.StringIO(
+            "phone_number,complaint_type,date,description\n" + "".join(
+                f"+1800{i:07d},IRS Scam,2025-10-01,Claimed to be IRS demanding payment\n"
+                for i in range(rows)
+            )
+        )
+        input_size = len(csv_stream.getvalue())
+        # A plain stub: a Mock would record every call and grow with the input
+        seeder.tool = SimpleNamespace(add_report=lambda **kw: True)
+        caplog.set_level(logging.WARNING, logger='scripts.seed_scam_db')
+        
+        tracemalloc.start()
+        try:
+            seeder.seed_from_ftc_csv(csv_stream)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        assert seeder.stats['ftc_added'] == rows
+        # Peak allocation stays flat, far below the size of the input
+        assert peak < input_size // 10
+    
+    def test_manual_data_seeding(self, mock_scam_tool, seeder):
         """Test manual curated data seeding."""
-        from scripts.seed_scam_db import ScamDatabaseSeeder
-        
-        with patch('scripts.seed_scam_db.get_scam_database_tool') as mock_tool:
-            mock_tool_instance = Mock()
-            mock_tool_instance.add_report.return_value = True
-            mock_tool.return_value = mock_tool_instance
-            
-            seeder = ScamDatabaseSeeder()
-            seeder.seed_manual_data()
-            
-            # Verify some manual data was added
-            assert seeder.stats['manual_added'] > 0
-            
-            # Verify add_report was called
-            assert mock_tool_instance.add_report.call_count > 0
+        _, mock_tool_instance = mock_scam_tool
+        
+        seeder.seed_manual_data()
+        
+        # Verify some manual data was added
+        assert seeder.stats['manual_added'] > 0
+        
+        # Verify add_report was called
+        assert mock_tool_instance.add_report.call_count > 0
 
 
+@pytest.mark.seeding
+@pytest.mark.xdist_group("seeding")
 class TestPhishTankUpdater:
     """Test PhishTank daily update script."""
     
-    @pytest.mark.asyncio
-    async def test_fetch_recent_entries(self):
+    async def test_fetch_recent_entries(self, mock_httpx, mock_scam_tool, frozen_clock):
         """Test fetching recent PhishTank entries."""
-        from scripts.update_phishtank import PhishTankUpdater
-        
         # Mock data with recent and old entries
-        now = datetime.now(timezone.utc)
-        recent_time = (now - timedelta(hours=12)).isoformat()
-        old_time = (now - timedelta(hours=72)).isoformat()
+        recent_time = (frozen_clock - timedelta(hours=12)).isoformat()
+        old_time = (frozen_clock - timedelta(hours=72)).isoformat()
         
         mock_data = [
             {
@@ -191,32 +366,37 @@ class TestPhishTankUpdater:
                 'verified': 'yes'
             }
         ]
+        mock_httpx(mock_data)
+        
+        updater = PhishTankUpdater()
+        recent_entries = await updater.fetch_recent_entries(hours=48)
         
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = Mock()
-            mock_response.json.return_value = mock_data
-            mock_response.raise_for_status = Mock()
-            
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.get.return_value = mock_response
-            mock_client.return_value = mock_client_instance
-            
-            updater = PhishTankUpdater()
-            recent_entries = await updater.fetch_recent_entries(hours=48)
-            
-            # Should only get the recent entry
-            assert len(recent_entries) == 1
-            assert recent_entries[0]['phish_id'] == '1'
-            assert updater.stats['total_fetched'] == 2
-            assert updater.stats['recent_entries'] == 1
+        # Should only get the recent entry
+        assert len(recent_entries) == 1
+        assert recent_entries[0]['phish_id'] == '1'
+        assert updater.stats['total_fetched'] == 2
+        assert updater.stats['recent_entries'] == 1
     
-    @pytest.mark.asyncio
-    async def test_update_database(self):
-        """Test database update with recent entries."""
-        from scripts.update_phishtank import PhishTankUpdater
+    async def test_phishtank_client_pooled_and_reused(self, mock_scam_tool, monkeypatch):
+        """Test repeated fetches share one pooled httpx client until aclose()."""
+        client = make_httpx_mock([])
+        client_cls = Mock(return_value=client)
+        monkeypatch.setattr('httpx.AsyncClient', client_cls)
+        
+        updater = PhishTankUpdater()
+        await updater.fetch_recent_entries()
+        await updater.fetch_recent_entries()
+        await updater.aclose()
         
+        client_cls.assert_called_once()
+        limits = client_cls.call_args.kwargs['limits']
+        assert limits.max_connections == 100
+        assert limits.max_keepalive_connections == 20
+        assert client.get.await_count == 2
+        client.aclose.assert_awaited_once()
+    
+    async def test_update_database(self, mock_scam_tool):
+        """Test database update with recent entries."""
         mock_entries = [
             {
                 'phish_id': '123',
@@ -225,325 +405,197 @@ class TestPhishTankUpdater:
                 'verified': 'yes'
             }
         ]
+        _, mock_tool_instance = mock_scam_tool
+        captured = []
+        mock_tool_instance.add_report.side_effect = (
+            lambda **kw: captured.append(kw) or True
+        )
+        
+        updater = PhishTankUpdater()
+        await updater.update_database(mock_entries)
         
-        with patch('scripts.update_phishtank.get_scam_database_tool') as mock_tool:
-            mock_tool_instance = Mock()
-            mock_tool_instance.add_report.return_value = True
-            mock_tool.return_value = mock_tool_instance
-            
-            updater = PhishTankUpdater()
-            await updater.update_database(mock_entries)
-            
-            assert updater.stats['added'] == 1
-            assert updater.stats['skipped'] == 0
-            
-            # Verify evidence includes update timestamp
-            call_args = mock_tool_instance.add_report.call_args
-            evidence = call_args[1]['evidence']
-            assert 'update_date' in evidence
+        assert updater.stats['added'] == 1
+        assert updater.stats['skipped'] == 0
+        
+        # Verify evidence includes update timestamp
+        assert len(captured) == 1
+        assert 'update_date' in captured[0]['evidence']
 
 
 class TestScamArchiver:
     """Test scam archival script."""
     
-    def test_find_archival_candidates(self):
+    def test_find_archival_candidates(self, frozen_clock, mock_archive_supabase, sample_reports):
         """Test finding old reports for archival."""
-        from scripts.archive_old_scams import ScamArchiver
-        
-        # Mock Supabase client
-        with patch('scripts.archive_old_scams.get_supabase_client') as mock_client:
-            # Create mock reports
-            old_date = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
-            
-            mock_reports = [
-                {
-                    'id': 1,
-                    'entity_type': 'phone',
-                    'entity_value': '+18005551234',
-                    'last_reported': old_date,
-                    'verified': False,
-                    'risk_score': 50.0
-                },
-                {
-                    'id': 2,
-                    'entity_type': 'url',
-                    'entity_value': 'old-scam.com',
-                    'last_reported': old_date,
-                    'verified': True,
-                    'risk_score': 95.0  # High risk, should be kept
-                },
-                {
-                    'id': 3,
-                    'entity_type': 'email',
-                    'entity_value': 'scam@example.com',
-                    'last_reported': old_date,
-                    'verified': False,
-                    'risk_score': 60.0
-                }
-            ]
-            
-            mock_response = Mock()
-            mock_response.data = mock_reports
-            
-            mock_table = Mock()
-            mock_table.select.return_value.lt.return_value.execute.return_value = mock_response
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            archiver = ScamArchiver()
-            candidates = archiver.find_archival_candidates(days=365)
-            
-            # Should return 2 candidates (not the verified high-risk one)
-            assert len(candidates) == 2
-            assert candidates[0]['id'] == 1
-            assert candidates[1]['id'] == 3
+        # The database applies the archivable filter, dropping the verified
+        # high-risk report before anything is returned
+        mock_archive_supabase.configure_mock(**{
+            'table.return_value.select.return_value.lt.return_value'
+            '.or_.return_value.execute.return_value.data': [sample_reports[0], sample_reports[2]]
+        })
+        mock_query = mock_archive_supabase.table.return_value.select.return_value
+        
+        archiver = ScamArchiver()
+        candidates = archiver.find_archival_candidates(days=365)
+        
+        # Should return 2 candidates (not the verified high-risk one)
+        assert len(candidates) == 2
+        assert candidates[0]['id'] == 1
+        assert candidates[1]['id'] == 3
+        assert archiver.stats['candidates'] == 2
+        
+        # The cutoff is exactly one year before the frozen clock
+        mock_query.lt.assert_called_once_with(
+            'last_reported', (frozen_clock - timedelta(days=365)).isoformat()
+        )
+        # Only unverified or at-most-70 risk reports are selected
+        mock_query.lt.return_value.or_.assert_called_once_with(
+            'verified.is.false,verified.is.null,risk_score.lte.70,risk_score.is.null'
+        )
     
-    def test_archive_reports(self):
+    def test_archive_reports(self, mock_archive_supabase, sample_reports):
         """Test archiving reports to archive table."""
-        from scripts.archive_old_scams import ScamArchiver
-        
-        with patch('scripts.archive_old_scams.get_supabase_client') as mock_client:
-            mock_reports = [
-                {
-                    'id': 1,
-                    'entity_type': 'phone',
-                    'entity_value': '+18005551234',
-                    'last_reported': '2024-01-01T00:00:00+00:00'
-                }
-            ]
-            
-            mock_table = Mock()
-            mock_table.insert.return_value.execute.return_value = Mock()
-            mock_table.delete.return_value.in_.return_value.execute.return_value = Mock()
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            archiver = ScamArchiver()
-            archiver.archive_reports(mock_reports, batch_size=50)
-            
-            assert archiver.stats['archived'] == 1
-            assert archiver.stats['failed'] == 0
-            
-            # Verify insert was called
-            assert mock_table.insert.called
-            
-            # Verify delete was called
-            assert mock_table.delete.called
+        reports = sample_reports[:1]
+        
+        # insert/delete chains return MagicMocks by default
+        mock_table = mock_archive_supabase.table.return_value
+        
+        archiver = ScamArchiver()
+        archiver.archive_reports(reports, batch_size=50)
+        
+        assert archiver.stats['archived'] == 1
+        assert archiver.stats['failed'] == 0
+        
+        # Verify insert was called
+        assert mock_table.insert.called
+        
+        # Verify delete was called
+        assert mock_table.delete.called
 
 
+@pytest.mark.admin
+@pytest.mark.xdist_group("admin")
 class TestAdminEndpoints:
     """Test admin API endpoints."""
     
-    @pytest.mark.asyncio
-    async def test_create_scam_report(self):
-        """Test POST /admin/scam-reports endpoint."""
-        from app.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        payload = {
-            "entity_type": "phone",
-            "entity_value": "+18005551234",
-            "evidence": {
-                "source": "user_report",
-                "date": "2025-10-18"
-            },
-            "notes": "Test scam report"
-        }
-        
-        with patch('app.main.get_scam_database_tool') as mock_tool:
-            mock_tool_instance = Mock()
-            mock_tool_instance.add_report.return_value = True
-            mock_tool.return_value = mock_tool_instance
-            
-            response = client.post("/admin/scam-reports", json=payload)
-            
-            assert response.status_code == 201
-            data = response.json()
-            assert data['message'] == "Scam report created successfully"
-    
-    @pytest.mark.asyncio
-    async def test_list_scam_reports(self):
-        """Test GET /admin/scam-reports endpoint."""
-        from app.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        with patch('app.db.client.get_supabase_client') as mock_client:
-            mock_reports = [
-                {
-                    'id': 1,
-                    'entity_type': 'phone',
-                    'entity_value': '+18005551234',
-                    'risk_score': 85.0
-                }
-            ]
-            
-            mock_response = Mock()
-            mock_response.data = mock_reports
-            
-            mock_table = Mock()
-            mock_query = Mock()
-            mock_query.order.return_value.limit.return_value.offset.return_value.execute.return_value = mock_response
-            mock_table.select.return_value = mock_query
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            response = client.get("/admin/scam-reports?limit=10&offset=0")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data['count'] == 1
-            assert len(data['reports']) == 1
+    @pytest.fixture
+    def mock_supabase(self, monkeypatch):
+        """Patch the app's Supabase client; returns the client MagicMock."""
+        mock_client = MagicMock()
+        monkeypatch.setattr('app.db.client.get_supabase_client', lambda: mock_client)
+        return mock_client
     
-    @pytest.mark.asyncio
-    async def test_update_scam_report(self):
-        """Test PATCH /admin/scam-reports/{id} endpoint."""
-        from app.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        payload = {
-            "verified": True,
-            "risk_score": 95.0,
-            "notes": "Manually verified as high-risk scam"
-        }
-        
-        with patch('app.db.client.get_supabase_client') as mock_client:
-            mock_updated_report = {
-                'id': 1,
-                'entity_type': 'phone',
-                'entity_value': '+18005551234',
-                'verified': True,
-                'risk_score': 95.0
-            }
-            
-            mock_response = Mock()
-            mock_response.data = [mock_updated_report]
-            
-            mock_table = Mock()
-            mock_table.update.return_value.eq.return_value.execute.return_value = mock_response
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            response = client.patch("/admin/scam-reports/1", json=payload)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data['message'] == "Scam report updated successfully"
-            assert data['report']['verified'] == True
+    @pytest.mark.parametrize("method,path,payload,query_data,expected_status,expected", [
+        pytest.param(
+            "POST", "/admin/scam-reports",
+            {
+                "entity_type": "phone",
+                "entity_value": "+18005551234",
+                "evidence": {
+                    "source": "user_report",
+                    "date": "2025-10-18"
+                },
+                "notes": "Test scam report"
+            },
+            {},
+            201,
+            {'message': "Scam report created successfully"},
+            id="create"
+        ),
+        pytest.param(
+            "GET", "/admin/scam-reports?limit=10&offset=0",
+            None,
+            {
+                'table.return_value.select.return_value.order.return_value'
+                '.limit.return_value.offset.return_value'
+                '.execute.return_value.data': _SAMPLE_REPORTS[:1]
+            },
+            200,
+            {'count': 1, 'reports': _SAMPLE_REPORTS[:1]},
+            id="list"
+        ),
+        pytest.param(
+            "PATCH", "/admin/scam-reports/1",
+            {
+                "verified": True,
+                "risk_score": 95.0,
+                "notes": "Manually verified as high-risk scam"
+            },
+            {
+                'table.return_value.update.return_value.eq.return_value'
+                '.execute.return_value.data': [_VERIFIED_REPORT]
+            },
+            200,
+            {
+                'message': "Scam report updated successfully",
+                'report': _VERIFIED_REPORT
+            },
+            id="update"
+        ),
+        pytest.param(
+            "DELETE", "/admin/scam-reports/1",
+            None,
+            {
+                'table.return_value.delete.return_value.eq.return_value'
+                '.execute.return_value.data': [{'id': 1}]
+            },
+            200,
+            {'message': "Scam report deleted successfully"},
+            id="delete"
+        ),
+    ])
+    async def test_admin_crud(
+        self, async_client, mock_supabase, monkeypatch,
+        method, path, payload, query_data, expected_status, expected
+    ):
+        """Test the create/list/update/delete /admin/scam-reports endpoints."""
+        mock_supabase.configure_mock(**query_data)
+        
+        # Report creation goes through the scam database tool
+        mock_tool_instance = Mock()
+        mock_tool_instance.add_report.return_value = True
+        monkeypatch.setattr('app.main.get_scam_database_tool', lambda: mock_tool_instance)
+        
+        response = await async_client.request(method, path, json=payload)
+        
+        assert response.status_code == expected_status
+        assert response.headers['content-type'].startswith('application/json')
+        data = orjson.loads(response.content)
+        for key, value in expected.items():
+            assert data[key] == value
     
-    @pytest.mark.asyncio
-    async def test_delete_scam_report(self):
-        """Test DELETE /admin/scam-reports/{id} endpoint."""
-        from app.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        with patch('app.db.client.get_supabase_client') as mock_client:
-            mock_response = Mock()
-            mock_response.data = [{'id': 1}]
-            
-            mock_table = Mock()
-            mock_table.delete.return_value.eq.return_value.execute.return_value = mock_response
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            response = client.delete("/admin/scam-reports/1")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data['message'] == "Scam report deleted successfully"
+    def test_admin_routes_use_orjson_response(self):
+        """Test every admin route serializes through ORJSONResponse."""
+        admin_routes = [
+            route for route in app.routes
+            if getattr(route, 'path', '').startswith('/admin/')
+        ]
+        
+        assert len(admin_routes) == 5
+        for route in admin_routes:
+            assert route.response_class is ORJSONResponse, route.path
     
-    @pytest.mark.asyncio
-    async def test_get_analytics(self):
+    async def test_get_analytics(self, async_client, mock_supabase, sample_reports):
         """Test GET /admin/scam-analytics endpoint."""
-        from app.main import app
-        from fastapi.testclient import TestClient
-        
-        client = TestClient(app)
-        
-        with patch('app.db.client.get_supabase_client') as mock_client:
-            mock_reports = [
-                {
-                    'id': 1,
-                    'entity_type': 'phone',
-                    'entity_value': '+18005551234',
-                    'risk_score': 85.0,
-                    'report_count': 10,
-                    'verified': True,
-                    'created_at': '2025-10-18T10:00:00+00:00'
-                },
-                {
-                    'id': 2,
-                    'entity_type': 'url',
-                    'entity_value': 'scam.com',
-                    'risk_score': 95.0,
-                    'report_count': 50,
-                    'verified': True,
-                    'created_at': '2025-10-17T10:00:00+00:00'
-                },
-                {
-                    'id': 3,
-                    'entity_type': 'phone',
-                    'entity_value': '+18005555678',
-                    'risk_score': 30.0,
-                    'report_count': 2,
-                    'verified': False,
-                    'created_at': '2025-10-16T10:00:00+00:00'
-                }
-            ]
-            
-            mock_response = Mock()
-            mock_response.data = mock_reports
-            
-            mock_table = Mock()
-            
-            # Mock for all_reports query
-            mock_table.select.return_value.execute.return_value = mock_response
-            
-            # Mock for top_scams query
-            mock_top_response = Mock()
-            mock_top_response.data = [mock_reports[1], mock_reports[0]]
-            mock_table.select.return_value.order.return_value.limit.return_value.execute.return_value = mock_top_response
-            
-            # Mock for recent query  
-            mock_recent_response = Mock()
-            mock_recent_response.data = mock_reports
-            
-            mock_client_instance = Mock()
-            mock_client_instance.table.return_value = mock_table
-            mock_client.return_value = mock_client_instance
-            
-            response = client.get("/admin/scam-analytics")
-            
-            assert response.status_code == 200
-            data = response.json()
-            
-            assert data['total_reports'] == 3
-            assert 'phone' in data['by_type']
-            assert 'url' in data['by_type']
-            assert data['by_type']['phone'] == 2
-            assert data['by_type']['url'] == 1
-            
-            # Check risk level breakdown
-            assert 'low' in data['by_risk_level']
-            assert 'high' in data['by_risk_level']
-            assert 'critical' in data['by_risk_level']
+        mock_supabase.configure_mock(**{
+            # all_reports query
+            'table.return_value.select.return_value'
+            '.execute.return_value.data': sample_reports,
+            # top_scams query
+            'table.return_value.select.return_value.order.return_value'
+            '.limit.return_value.execute.return_value.data': [sample_reports[1], sample_reports[0]]
+        })
+        
+        response = await async_client.get("/admin/scam-analytics")
+        
+        assert response.status_code == 200
+        data = orjson.loads(response.content)
+        
+        assert data['total_reports'] == 3
+        assert data['by_type'] == {'phone': 2, 'url': 1}
+        
+        # Check risk level breakdown
+        assert {'low', 'high', 'critical'}.issubset(data['by_risk_level'])
 
 
 if __name__ == "__main__":
@@ -102,6 +102,25 @@ class TestMCPAgentOrchestrator:
             assert orchestrator.phone_tool is not None
             assert orchestrator.reasoner is not None
     
+    async def test_aclose_releases_pooled_clients(self):
+        """Test aclose() closes the pooled HTTP clients of the shared singletons."""
+        with patch.multiple(
+            'app.agents.mcp_agent',
+            get_entity_extractor=MagicMock(),
+            get_scam_database_tool=MagicMock(),
+            get_exa_search_tool=MagicMock(),
+            get_domain_reputation_tool=MagicMock(),
+            get_phone_validator_tool=MagicMock(),
+            get_company_verification_tool=MagicMock(return_value=AsyncMock()),
+            get_agent_reasoner=MagicMock(return_value=AsyncMock())
+        ):
+            orchestrator = MCPAgentOrchestrator()
+        
+        await orchestrator.aclose()
+        
+        orchestrator.company_tool.aclose.assert_awaited_once()
+        orchestrator.reasoner.aclose.assert_awaited_once()
+    
     async def test_analyze_no_entities(self, mock_entities_empty, mock_progress_publisher):
         """Test analysis when no entities are found."""
         with patch('app.services.gemini_service.get_model'), \